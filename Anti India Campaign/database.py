@@ -7,11 +7,20 @@ import os
 # Database configuration
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), 'campaign_data.db')
 
+def _connect():
+    """Open a connection with relaxed syncing; safe once the database is in WAL mode"""
+    conn = sqlite3.connect(DATABASE_PATH)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
 def init_database():
     """Initialize the SQLite database with required tables"""
     conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
     
+    # Write-ahead logging lets readers proceed during inserts; the mode persists in the file
+    cursor.execute('PRAGMA journal_mode=WAL')
+    
     # Create articles table with all required columns
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS articles (
@@ -50,6 +59,9 @@ def init_database():
             except Exception as e:
                 print(f"Column {column_name} already exists or error: {e}")
     
+    # Recent-article lookups filter and sort on collected_date; url is already indexed by its UNIQUE constraint
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_collected ON articles (collected_date)')
+    
     # Create campaigns table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS campaigns (
@@ -67,29 +79,35 @@ def init_database():
     conn.commit()
     conn.close()
 
+_INSERT_ARTICLE_SQL = '''
+    INSERT OR REPLACE INTO articles 
+    (title, content, url, source, published_date, sentiment_score, 
+     relevance_score, countries_mentioned, keywords_found, classification)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _article_row(article_data):
+    """Build the articles table parameters for one article dict"""
+    return (
+        article_data.get('title'),
+        article_data.get('content'),
+        article_data.get('url'),
+        article_data.get('source'),
+        article_data.get('published_date'),
+        article_data.get('sentiment_score'),
+        article_data.get('relevance_score'),
+        json.dumps(article_data.get('countries_mentioned', [])),
+        json.dumps(article_data.get('keywords_found', [])),
+        article_data.get('classification')
+    )
+
 def save_article(article_data):
     """Save article to database"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _connect()
     cursor = conn.cursor()
     last_id = None
     try:
-        cursor.execute('''
-            INSERT OR REPLACE INTO articles 
-            (title, content, url, source, published_date, sentiment_score, 
-             relevance_score, countries_mentioned, keywords_found, classification)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            article_data.get('title'),
-            article_data.get('content'),
-            article_data.get('url'),
-            article_data.get('source'),
-            article_data.get('published_date'),
-            article_data.get('sentiment_score'),
-            article_data.get('relevance_score'),
-            json.dumps(article_data.get('countries_mentioned', [])),
-            json.dumps(article_data.get('keywords_found', [])),
-            article_data.get('classification')
-        ))
+        cursor.execute(_INSERT_ARTICLE_SQL, _article_row(article_data))
         conn.commit()
         last_id = cursor.lastrowid
         try:
@@ -107,6 +125,54 @@ def save_article(article_data):
             pass
         conn.close()
 
+def save_articles_bulk(articles):
+    """Save a batch of articles with one executemany and a single commit.
+
+    If the batch fails, rows are retried one by one and invalid ones skipped.
+    Returns the number of articles written.
+    """
+    if not articles:
+        return 0
+    conn = _connect()
+    try:
+        try:
+            with conn:
+                conn.executemany(_INSERT_ARTICLE_SQL, [_article_row(a) for a in articles])
+            saved = len(articles)
+        except Exception as e:
+            # The failed batch was rolled back; insert row by row so only the bad rows are lost
+            print(f"⚠️ Batch of {len(articles)} articles failed ({e}); saving one by one")
+            saved = 0
+            with conn:
+                for article in articles:
+                    try:
+                        conn.execute(_INSERT_ARTICLE_SQL, _article_row(article))
+                        saved += 1
+                    except Exception as row_error:
+                        print(f"❌ Skipped article {article.get('url')}: {row_error}")
+        print(f"✅ Saved {saved} articles to {DATABASE_PATH}")
+        return saved
+    except Exception as e:
+        print(f"❌ Failed to save {len(articles)} articles: {e}")
+        return 0
+    finally:
+        conn.close()
+
+def get_article_urls(since=None):
+    """Return the set of stored article URLs, optionally only those collected since a UTC timestamp"""
+    conn = _connect()
+    try:
+        if since:
+            cursor = conn.execute("SELECT url FROM articles WHERE collected_date >= ?", (since,))
+        else:
+            cursor = conn.execute("SELECT url FROM articles")
+        return {row[0] for row in cursor if row[0]}
+    except Exception as e:
+        print(f"❌ Failed to load article URLs: {e}")
+        return set()
+    finally:
+        conn.close()
+
 def get_articles(limit=100, filters=None):
     """Retrieve articles from database with optional filters"""
     conn = sqlite3.connect(DATABASE_PATH)
@@ -8,9 +8,22 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
+from collections import namedtuple
 import json
 import re
 
+# Normalized row for viral content cards; defaults are filled once per report
+ContentRow = namedtuple(
+    'ContentRow',
+    'title source virality engagement_rate likes shares comments retweets published_date url'
+)
+
+_CONTENT_DEFAULTS = {
+    'title': '', 'source': '', 'virality_score': 0.0, 'engagement_rate': 0.0,
+    'likes': 0, 'shares': 0, 'comments': 0, 'retweets': 0,
+    'published_date': 'Unknown', 'url': '#'
+}
+
 class EngagementAnalyzer:
     def __init__(self, db_path=None):
         # Default to canonical DATABASE_PATH if available
@@ -427,6 +440,18 @@ class EngagementAnalyzer:
         
         return anomalies
     
+    def _to_content_rows(self, df: pd.DataFrame) -> List[ContentRow]:
+        """Convert top-content query results to ContentRow tuples with defaults filled"""
+        df = df.fillna(value=_CONTENT_DEFAULTS)
+        return [
+            ContentRow(
+                row.title, row.source, row.virality_score, row.engagement_rate,
+                row.likes, row.shares, row.comments, row.retweets,
+                row.published_date, row.url
+            )
+            for row in df.itertuples(index=False)
+        ]
+    
     def generate_engagement_report(self, days: int = 7) -> Dict:
         """Generate comprehensive engagement analysis report"""
         conn = sqlite3.connect(self.db_path)
@@ -474,7 +499,7 @@ class EngagementAnalyzer:
             LIMIT 30
         '''.format(days)
         
-        top_content = pd.read_sql_query(top_content_query, conn).to_dict('records')
+        top_content = self._to_content_rows(pd.read_sql_query(top_content_query, conn))
         platform_performance = pd.read_sql_query(platform_query, conn).to_dict('records')
         trending_keywords = pd.read_sql_query(trending_query, conn).to_dict('records')
         
@@ -15,12 +15,45 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import networkx as nx
 import os
+import shutil
 from database import init_database, get_articles, get_statistics, save_article
 from enhanced_keyword_database import KeywordDatabase
 from engagement_analyzer import EngagementAnalyzer
 from campaign_detector import CoordinatedCampaignDetector
 from ai_analyzer import AIAnalyzer
-from enhanced_data_collector import EnhancedDataCollector
+from enhanced_data_collector import EnhancedDataCollector, COLLECTED_ARTICLES_FILE, LEGACY_COLLECTED_CSV
+
+# Scope reruns to a single block where supported (st.fragment, or
+# st.experimental_fragment on older Streamlit); otherwise run inline
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+# Badge CSS class and accent color per threat level, shared by the card loops
+_THREAT_CSS_CLASS = {lvl: f'threat-{lvl.lower()}' for lvl in ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')}
+_THREAT_COLORS = {
+    'CRITICAL': '#ff1744',
+    'HIGH': '#ff5252',
+    'MEDIUM': '#ff9800',
+    'LOW': '#4caf50'
+}
+
+# Simulated alert feed: (age, level, title, description, action)
+_ALERT_TEMPLATES = (
+    (timedelta(minutes=5), 'CRITICAL', 'Coordinated Bot Network Detected',
+     'High-confidence bot network with 50+ accounts pushing #BoycottIndia hashtag',
+     'Immediate investigation required'),
+    (timedelta(minutes=15), 'HIGH', 'Viral Anti-India Content Spreading',
+     'Content with 10,000+ shares containing anti-India disinformation',
+     'Platform reporting recommended'),
+    (timedelta(minutes=30), 'MEDIUM', 'Keyword Trend Anomaly',
+     'Unusual spike in "India terrorism" mentions across multiple platforms',
+     'Enhanced monitoring activated'),
+    (timedelta(hours=1), 'HIGH', 'Cross-Platform Campaign Coordination',
+     'Synchronized posting detected across Twitter, Facebook, and Instagram',
+     'Campaign analysis in progress'),
+    (timedelta(hours=2), 'MEDIUM', 'New Influencer Identified',
+     'Account with 100K+ followers started spreading anti-India content',
+     'Profile analysis recommended'),
+)
 
 # Page config
 st.set_page_config(
@@ -817,24 +850,26 @@ def show_campaign_detection(campaign_detector, keyword_db):
         display_time_col = None
 
     # Render table with clickable URL column if present
-    display_df = recent.copy()
-    if 'url' in display_df.columns:
-        # Create a column with anchor tags
-        display_df['link'] = display_df['url'].apply(lambda u: f"<a href='{u}' target='_blank'>{u}</a>")
+    if 'url' in recent.columns:
         # Choose which time column to show
         if display_time_col:
             time_col_name = display_time_col
         else:
             time_col_name = None
 
-        if 'title' in display_df.columns:
-            cols_to_show = [c for c in [time_col_name, 'source', 'title', 'link'] if c]
+        if 'title' in recent.columns:
+            cols_to_show = [c for c in [time_col_name, 'source', 'title'] if c]
         else:
-            cols_to_show = [c for c in [time_col_name, 'source', 'link'] if c]
+            cols_to_show = [c for c in [time_col_name, 'source'] if c]
+
+        # Copy only the displayed columns and build the anchor column in one vectorized write
+        display_df = recent[cols_to_show].copy()
+        urls = recent['url'].astype(str)
+        display_df['link'] = "<a href='" + urls + "' target='_blank'>" + urls + "</a>"
 
-        st.write(display_df[cols_to_show].to_html(escape=False, index=False), unsafe_allow_html=True)
+        st.write(display_df.to_html(escape=False, index=False), unsafe_allow_html=True)
     else:
-        st.dataframe(display_df.head(50))
+        st.dataframe(recent.head(50))
 
     # CSV export
     csv_bytes = recent.to_csv(index=False).encode('utf-8')
@@ -886,196 +921,217 @@ def show_engagement_analysis(engagement_analyzer):
     ])
     
     with eng_tab1:
-        st.subheader("🔥 Most Viral Anti-India Content")
-        
-        top_content = engagement_report['top_viral_content']
-        
-        if top_content:
-            for i, content in enumerate(top_content[:5]):
-                virality = content.get('virality_score', 0)
-                color_intensity = min(255, int(virality * 50))
-                
-                st.markdown(f"""
-                <div style="background: linear-gradient(90deg, rgba(255,{255-color_intensity},{255-color_intensity},0.2), transparent); 
-                            padding: 15px; margin: 10px 0; border-radius: 10px; 
-                            border-left: 4px solid rgb(255,{255-color_intensity},{255-color_intensity});">
-                    <h4>📰 {content['title'][:100]}...</h4>
-                    <p><strong>Source:</strong> {content['source']} 
-                       <strong>Virality Score:</strong> {virality:.2f}
-                       <strong>Engagement Rate:</strong> {content.get('engagement_rate', 0):.2f}
-                    </p>
-                    <p><strong>Engagement:</strong> 
-                       👍 {content.get('likes', 0)} | 
-                       🔄 {content.get('shares', 0)} | 
-                       💬 {content.get('comments', 0)} | 
-                       🔁 {content.get('retweets', 0)}
-                    </p>
-                    <p><strong>Published:</strong> {content.get('published_date', 'Unknown')}</p>
-                    <a href="{content.get('url', '#')}" target="_blank">🔗 View Content</a>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("📊 No viral content data available. Run data collection first.")
+        _render_viral_tab(engagement_report['top_viral_content'])
     
     with eng_tab2:
-        st.subheader("📱 Platform Performance Analysis")
-        
-        platform_performance = engagement_report['platform_performance']
-        
-        if platform_performance:
-            platform_df = pd.DataFrame(platform_performance)
-            
-            # Platform comparison charts
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig_content = px.bar(
-                    platform_df,
-                    x='platform',
-                    y='content_count',
-                    title="Content Volume by Platform",
-                    color='total_virality',
-                    color_continuous_scale='Reds'
-                )
-                st.plotly_chart(fig_content, use_container_width=True, key="content_volume_chart")
-            
-            with col2:
-                fig_engagement = px.bar(
-                    platform_df,
-                    x='platform',
-                    y='avg_engagement',
-                    title="Average Engagement by Platform",
-                    color='total_interactions',
-                    color_continuous_scale='Blues'
-                )
-                st.plotly_chart(fig_engagement, use_container_width=True, key="engagement_platform_chart")
-            
-            # Detailed platform metrics
-            st.markdown("#### Platform Metrics Details")
-            for platform in platform_performance:
-                st.markdown(f"""
-                **{platform['platform']}:**
-                - Content Count: {platform['content_count']}
-                - Avg Engagement: {platform['avg_engagement']:.3f}
-                - Total Virality: {platform['total_virality']:.2f}
-                - Total Interactions: {platform['total_interactions']}
-                """)
-        else:
-            st.info("📱 No platform performance data available.")
+        _render_platform_tab(engagement_report['platform_performance'])
     
     with eng_tab3:
-        st.subheader("👥 Key Influencer Analysis")
-        
-        key_influencers = engagement_report['key_influencers']
-        
-        if key_influencers:
-            # Influencer network visualization
-            influencer_df = pd.DataFrame(key_influencers[:10])
-            
-            fig_influencers = px.scatter(
-                influencer_df,
-                x='follower_count',
-                y='influence_score',
-                size='activity_count',
-                color='threat_level',
-                hover_name='username',
-                hover_data=['platform', 'verified'],
-                title="Key Influencer Mapping",
-                color_discrete_map={
-                    'HIGH': '#ff5252',
-                    'MEDIUM': '#ff9800', 
-                    'LOW': '#4caf50'
-                }
-            )
-            
-            st.plotly_chart(fig_influencers, use_container_width=True, key="influencers_chart")
-            
-            # Detailed influencer profiles
-            st.markdown("#### 🎯 Top Threat Influencers")
-            
-            for influencer in key_influencers[:5]:
-                threat_color = {
-                    'HIGH': '#ff5252',
-                    'MEDIUM': '#ff9800',
-                    'LOW': '#4caf50'
-                }.get(influencer['threat_level'], '#4caf50')
-                
-                verified_badge = "✅" if influencer.get('verified') else "❌"
-                
-                st.markdown(f"""
-                <div style="background: {threat_color}22; padding: 15px; margin: 10px 0; 
-                            border-radius: 10px; border-left: 4px solid {threat_color};">
-                    <h4>👤 @{influencer['username']} {verified_badge}</h4>
-                    <p><strong>Platform:</strong> {influencer['platform']} 
-                       <strong>Threat Level:</strong> 
-                       <span class="threat-badge threat-{influencer['threat_level'].lower()}">{influencer['threat_level']}</span>
-                    </p>
-                    <p><strong>Followers:</strong> {influencer['follower_count']:,} 
-                       <strong>Influence Score:</strong> {influencer['influence_score']:.2f}
-                       <strong>Activity Count:</strong> {influencer['activity_count']}
-                    </p>
-                    <p><strong>Last Activity:</strong> {influencer.get('last_activity', 'Unknown')}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("👥 No key influencer data available.")
+        _render_influencer_tab(engagement_report['key_influencers'])
     
     with eng_tab4:
-        st.subheader("📈 Trending Anomaly Detection")
-        
-        trending_anomalies = engagement_report['trending_anomalies']
-        
-        if trending_anomalies:
-            # Anomaly visualization
-            anomaly_df = pd.DataFrame(trending_anomalies[:20])
-            
-            fig_anomalies = px.scatter(
-                anomaly_df,
-                x='current_mentions',
-                y='anomaly_strength',
-                size='unique_users',
-                color='threat_level',
-                hover_name='keyword_or_hashtag',
-                hover_data=['platform', 'engagement_sum'],
-                title="Trending Anomaly Detection",
-                color_discrete_map={
-                    'HIGH': '#ff5252',
-                    'MEDIUM': '#ff9800',
-                    'LOW': '#4caf50'
-                }
+        _render_anomaly_tab(engagement_report['trending_anomalies'])
+
+@fragment
+def _render_viral_tab(top_content):
+    """Render the top viral content cards"""
+    st.subheader("🔥 Most Viral Anti-India Content")
+
+    if top_content:
+        cards = top_content[:5]
+        # Card tint per virality, computed for all cards at once
+        viralities = np.fromiter((c.virality for c in cards), dtype=np.float32, count=len(cards))
+        intensities = np.minimum(255, (viralities * 50).astype(np.int32))
+        fades = (255 - intensities).tolist()
+
+        for content, fade in zip(cards, fades):
+            virality = content.virality
+
+            st.markdown(f"""
+            <div style="background: linear-gradient(90deg, rgba(255,{fade},{fade},0.2), transparent); 
+                        padding: 15px; margin: 10px 0; border-radius: 10px; 
+                        border-left: 4px solid rgb(255,{fade},{fade});">
+                <h4>📰 {content.title[:100]}...</h4>
+                <p><strong>Source:</strong> {content.source} 
+                   <strong>Virality Score:</strong> {virality:.2f}
+                   <strong>Engagement Rate:</strong> {content.engagement_rate:.2f}
+                </p>
+                <p><strong>Engagement:</strong> 
+                   👍 {content.likes} | 
+                   🔄 {content.shares} | 
+                   💬 {content.comments} | 
+                   🔁 {content.retweets}
+                </p>
+                <p><strong>Published:</strong> {content.published_date}</p>
+                <a href="{content.url}" target="_blank">🔗 View Content</a>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("📊 No viral content data available. Run data collection first.")
+
+@fragment
+def _render_platform_tab(platform_performance):
+    """Render platform comparison charts and metrics"""
+    st.subheader("📱 Platform Performance Analysis")
+
+    if platform_performance:
+        platform_df = pd.DataFrame.from_records(
+            platform_performance,
+            columns=['platform', 'content_count', 'avg_engagement', 'total_virality', 'total_interactions']
+        )
+
+        # Platform comparison charts
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig_content = px.bar(
+                platform_df,
+                x='platform',
+                y='content_count',
+                title="Content Volume by Platform",
+                color='total_virality',
+                color_continuous_scale='Reds'
             )
-            
-            st.plotly_chart(fig_anomalies, use_container_width=True, key="anomalies_chart")
-            
-            # Detailed anomaly list
-            st.markdown("#### ⚠️ Detected Anomalies")
-            
-            for anomaly in trending_anomalies[:10]:
-                threat_color = {
-                    'HIGH': '#ff5252',
-                    'MEDIUM': '#ff9800',
-                    'LOW': '#4caf50'
-                }[anomaly['threat_level']]
-                
-                st.markdown(f"""
-                <div style="background: {threat_color}22; padding: 15px; margin: 10px 0; 
-                            border-radius: 10px; border-left: 4px solid {threat_color};">
-                    <h4>📊 {anomaly['keyword_or_hashtag']}</h4>
-                    <p><strong>Platform:</strong> {anomaly['platform']} 
-                       <strong>Threat Level:</strong> 
-                       <span class="threat-badge threat-{anomaly['threat_level'].lower()}">{anomaly['threat_level']}</span>
-                    </p>
-                    <p><strong>Current Mentions:</strong> {anomaly['current_mentions']} 
-                       (Average: {anomaly['average_mentions']:.1f})
-                    </p>
-                    <p><strong>Anomaly Strength:</strong> {anomaly['anomaly_strength']:.2f}σ 
-                       <strong>Unique Users:</strong> {anomaly['unique_users']}
-                    </p>
-                    <p><strong>Timestamp:</strong> {anomaly['timestamp']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("📈 No trending anomalies detected.")
+            st.plotly_chart(fig_content, use_container_width=True, key="content_volume_chart")
+
+        with col2:
+            fig_engagement = px.bar(
+                platform_df,
+                x='platform',
+                y='avg_engagement',
+                title="Average Engagement by Platform",
+                color='total_interactions',
+                color_continuous_scale='Blues'
+            )
+            st.plotly_chart(fig_engagement, use_container_width=True, key="engagement_platform_chart")
+
+        # Detailed platform metrics
+        st.markdown("#### Platform Metrics Details")
+        for platform in platform_performance:
+            st.markdown(f"""
+            **{platform['platform']}:**
+            - Content Count: {platform['content_count']}
+            - Avg Engagement: {platform['avg_engagement']:.3f}
+            - Total Virality: {platform['total_virality']:.2f}
+            - Total Interactions: {platform['total_interactions']}
+            """)
+    else:
+        st.info("📱 No platform performance data available.")
+
+@fragment
+def _render_influencer_tab(key_influencers):
+    """Render the key influencer map and profiles"""
+    st.subheader("👥 Key Influencer Analysis")
+
+    if key_influencers:
+        # Influencer network visualization
+        influencer_df = pd.DataFrame.from_records(
+            key_influencers[:10],
+            columns=['username', 'platform', 'verified', 'follower_count',
+                     'influence_score', 'activity_count', 'threat_level']
+        )
+
+        fig_influencers = px.scatter(
+            influencer_df,
+            x='follower_count',
+            y='influence_score',
+            size='activity_count',
+            color='threat_level',
+            hover_name='username',
+            hover_data=['platform', 'verified'],
+            title="Key Influencer Mapping",
+            color_discrete_map={
+                'HIGH': '#ff5252',
+                'MEDIUM': '#ff9800', 
+                'LOW': '#4caf50'
+            }
+        )
+
+        st.plotly_chart(fig_influencers, use_container_width=True, key="influencers_chart")
+
+        # Detailed influencer profiles
+        st.markdown("#### 🎯 Top Threat Influencers")
+
+        for influencer in key_influencers[:5]:
+            threat_color = _THREAT_COLORS.get(influencer['threat_level'], '#4caf50')
+            threat_css = _THREAT_CSS_CLASS.get(influencer['threat_level'], 'threat-low')
+
+            verified_badge = "✅" if influencer.get('verified') else "❌"
+
+            st.markdown(f"""
+            <div style="background: {threat_color}22; padding: 15px; margin: 10px 0; 
+                        border-radius: 10px; border-left: 4px solid {threat_color};">
+                <h4>👤 @{influencer['username']} {verified_badge}</h4>
+                <p><strong>Platform:</strong> {influencer['platform']} 
+                   <strong>Threat Level:</strong> 
+                   <span class="threat-badge {threat_css}">{influencer['threat_level']}</span>
+                </p>
+                <p><strong>Followers:</strong> {influencer['follower_count']:,} 
+                   <strong>Influence Score:</strong> {influencer['influence_score']:.2f}
+                   <strong>Activity Count:</strong> {influencer['activity_count']}
+                </p>
+                <p><strong>Last Activity:</strong> {influencer.get('last_activity', 'Unknown')}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("👥 No key influencer data available.")
+
+@fragment
+def _render_anomaly_tab(trending_anomalies):
+    """Render trending anomaly chart and details"""
+    st.subheader("📈 Trending Anomaly Detection")
+
+    if trending_anomalies:
+        # Anomaly visualization
+        anomaly_df = pd.DataFrame.from_records(
+            trending_anomalies[:20],
+            columns=['keyword_or_hashtag', 'platform', 'current_mentions', 'anomaly_strength',
+                     'unique_users', 'engagement_sum', 'threat_level']
+        )
+
+        fig_anomalies = px.scatter(
+            anomaly_df,
+            x='current_mentions',
+            y='anomaly_strength',
+            size='unique_users',
+            color='threat_level',
+            hover_name='keyword_or_hashtag',
+            hover_data=['platform', 'engagement_sum'],
+            title="Trending Anomaly Detection",
+            color_discrete_map={
+                'HIGH': '#ff5252',
+                'MEDIUM': '#ff9800',
+                'LOW': '#4caf50'
+            }
+        )
+
+        st.plotly_chart(fig_anomalies, use_container_width=True, key="anomalies_chart")
+
+        # Detailed anomaly list
+        st.markdown("#### ⚠️ Detected Anomalies")
+
+        for anomaly in trending_anomalies[:10]:
+            threat_color = _THREAT_COLORS[anomaly['threat_level']]
+
+            st.markdown(f"""
+            <div style="background: {threat_color}22; padding: 15px; margin: 10px 0; 
+                        border-radius: 10px; border-left: 4px solid {threat_color};">
+                <h4>📊 {anomaly['keyword_or_hashtag']}</h4>
+                <p><strong>Platform:</strong> {anomaly['platform']} 
+                   <strong>Threat Level:</strong> 
+                   <span class="threat-badge {_THREAT_CSS_CLASS[anomaly['threat_level']]}">{anomaly['threat_level']}</span>
+                </p>
+                <p><strong>Current Mentions:</strong> {anomaly['current_mentions']} 
+                   (Average: {anomaly['average_mentions']:.1f})
+                </p>
+                <p><strong>Anomaly Strength:</strong> {anomaly['anomaly_strength']:.2f}σ 
+                   <strong>Unique Users:</strong> {anomaly['unique_users']}
+                </p>
+                <p><strong>Timestamp:</strong> {anomaly['timestamp']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("📈 No trending anomalies detected.")
 
 def show_network_mapping(engagement_analyzer):
     """Network mapping and relationship analysis"""
@@ -1131,53 +1187,14 @@ def show_alert_center(campaign_detector, engagement_analyzer):
     st.markdown("### 📢 Live Alert Feed")
     
     # Simulate real-time alerts
+    now = datetime.now()
     alerts = [
-        {
-            'time': datetime.now() - timedelta(minutes=5),
-            'level': 'CRITICAL',
-            'title': 'Coordinated Bot Network Detected',
-            'description': 'High-confidence bot network with 50+ accounts pushing #BoycottIndia hashtag',
-            'action': 'Immediate investigation required'
-        },
-        {
-            'time': datetime.now() - timedelta(minutes=15),
-            'level': 'HIGH', 
-            'title': 'Viral Anti-India Content Spreading',
-            'description': 'Content with 10,000+ shares containing anti-India disinformation',
-            'action': 'Platform reporting recommended'
-        },
-        {
-            'time': datetime.now() - timedelta(minutes=30),
-            'level': 'MEDIUM',
-            'title': 'Keyword Trend Anomaly',
-            'description': 'Unusual spike in "India terrorism" mentions across multiple platforms',
-            'action': 'Enhanced monitoring activated'
-        },
-        {
-            'time': datetime.now() - timedelta(hours=1),
-            'level': 'HIGH',
-            'title': 'Cross-Platform Campaign Coordination',
-            'description': 'Synchronized posting detected across Twitter, Facebook, and Instagram',
-            'action': 'Campaign analysis in progress'
-        },
-        {
-            'time': datetime.now() - timedelta(hours=2),
-            'level': 'MEDIUM',
-            'title': 'New Influencer Identified',
-            'description': 'Account with 100K+ followers started spreading anti-India content',
-            'action': 'Profile analysis recommended'
-        }
+        {'time': now - offset, 'level': level, 'title': title, 'description': description, 'action': action}
+        for offset, level, title, description, action in _ALERT_TEMPLATES
     ]
     
     for alert in alerts:
-        level_colors = {
-            'CRITICAL': '#ff1744',
-            'HIGH': '#ff5252',
-            'MEDIUM': '#ff9800',
-            'LOW': '#4caf50'
-        }
-        
-        color = level_colors[alert['level']]
+        color = _THREAT_COLORS[alert['level']]
         
         st.markdown(f"""
         <div style="background: {color}22; padding: 15px; margin: 10px 0; 
@@ -1185,7 +1202,7 @@ def show_alert_center(campaign_detector, engagement_analyzer):
             <div style="display: flex; justify-content: space-between; align-items: center;">
                 <h4 style="margin: 0;">{alert['title']}</h4>
                 <div>
-                    <span class="threat-badge threat-{alert['level'].lower()}">{alert['level']}</span>
+                    <span class="threat-badge {_THREAT_CSS_CLASS[alert['level']]}">{alert['level']}</span>
                     <small style="margin-left: 10px; opacity: 0.7;">{alert['time'].strftime('%H:%M')}</small>
                 </div>
             </div>
@@ -1195,31 +1212,36 @@ def show_alert_center(campaign_detector, engagement_analyzer):
         """, unsafe_allow_html=True)
     
     # Alert configuration
+    _render_alert_config()
+
+@fragment
+def _render_alert_config():
+    """Render alert notification settings and thresholds"""
     st.markdown("### ⚙️ Alert Configuration")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.markdown("#### 📧 Notification Settings")
         email_alerts = st.checkbox("Email Alerts", value=True)
         sms_alerts = st.checkbox("SMS Alerts", value=False)
         webhook_alerts = st.checkbox("Webhook Notifications", value=True)
-        
+
         if email_alerts:
             email_address = st.text_input("Email Address", value="security@example.com")
-        
+
         alert_frequency = st.selectbox(
             "Alert Frequency",
             ["Immediate", "Every 5 minutes", "Every 15 minutes", "Hourly", "Daily"]
         )
-    
+
     with col2:
         st.markdown("#### 🎯 Alert Thresholds")
-        
+
         critical_threshold = st.slider("Critical Alert Threshold", 0.7, 1.0, 0.9, 0.05)
         high_threshold = st.slider("High Alert Threshold", 0.5, 0.9, 0.7, 0.05)
         medium_threshold = st.slider("Medium Alert Threshold", 0.3, 0.7, 0.5, 0.05)
-        
+
         st.markdown("#### 📱 Platform Priorities")
         platform_weights = {}
         for platform in ['Twitter', 'Facebook', 'Instagram', 'Reddit', 'TikTok']:
@@ -1495,8 +1517,10 @@ def show_enhanced_data_collection(keyword_db):
     
     # Check for existing collection files
     collection_files = [
-        "enhanced_collected_articles.csv",
+        COLLECTED_ARTICLES_FILE,
+        LEGACY_COLLECTED_CSV,
         "found_urls_enhanced.txt",
+        "found_urls_enhanced.pkl",
         "collected_articles.csv"
     ]
     
@@ -1592,12 +1616,44 @@ def run_enhanced_collection(max_results, delay_min, delay_max, mode, threshold,
             - Check your internet connection
             """)
 
+# Columns read for the collection summary metrics
+_SUMMARY_COLS = ('timestamp', 'threat_level', 'platform_type')
+_SUMMARY_DTYPES = {'threat_level': 'category', 'platform_type': 'category'}
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_collected(path, mtime, columns=None):
+    """Read a collection file; mtime is part of the cache key so edits reload it"""
+    columns = list(columns) if columns else None
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=columns)
+        if columns:
+            df = df.astype({c: t for c, t in _SUMMARY_DTYPES.items() if c in columns})
+    else:
+        df = pd.read_csv(path, usecols=columns, dtype=_SUMMARY_DTYPES if columns else None)
+    if columns and 'timestamp' in columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+    return df
+
+def load_collected_articles(columns=None):
+    """Load enhanced collection results, falling back to the legacy CSV.
+
+    Pass a tuple of column names to read only those columns; timestamp is
+    then parsed to datetimes and the summary columns are categoricals.
+    """
+    for path in (COLLECTED_ARTICLES_FILE, LEGACY_COLLECTED_CSV):
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        return _load_collected(path, mtime, columns)
+    return None
+
 def show_collection_summary():
     """Show collection results summary"""
     try:
         # Try to load enhanced data
-        if os.path.exists("enhanced_collected_articles.csv"):
-            df = pd.read_csv("enhanced_collected_articles.csv")
+        df = load_collected_articles(_SUMMARY_COLS)
+        if df is not None:
             
             if not df.empty:
                 st.success(f"📊 Enhanced data loaded: {len(df)} articles")
@@ -1623,7 +1679,8 @@ def show_collection_summary():
                         st.metric("Platforms Covered", "N/A")
                 
                 with col4:
-                    recent_24h = len(df[pd.to_datetime(df['timestamp']) > datetime.now() - timedelta(hours=24)])
+                    cutoff = pd.Timestamp.now() - pd.Timedelta(hours=24)
+                    recent_24h = int((df['timestamp'] >= cutoff).sum())
                     st.metric("Last 24 Hours", recent_24h)
                 
                 # Data visualization
@@ -1644,8 +1701,8 @@ def show_collection_summary():
 def show_raw_collection_data():
     """Show raw collection data"""
     try:
-        if os.path.exists("enhanced_collected_articles.csv"):
-            df = pd.read_csv("enhanced_collected_articles.csv")
+        df = load_collected_articles()
+        if df is not None:
             
             if not df.empty:
                 st.dataframe(df, use_container_width=True)
@@ -1666,14 +1723,34 @@ def show_raw_collection_data():
     except Exception as e:
         st.error(f"Error displaying raw data: {e}")
 
+def _entry_size(entry):
+    """Size of a collection file, or the total of the part files in a dataset directory"""
+    if entry.is_dir():
+        with os.scandir(entry.path) as it:
+            return sum(part.stat().st_size for part in it if part.is_file())
+    return entry.stat().st_size
+
+def _remove_entry(entry):
+    if entry.is_dir():
+        shutil.rmtree(entry.path)
+    else:
+        os.remove(entry.path)
+
 def show_file_manager(collection_files):
     """Show file management interface"""
     st.subheader("📁 Collection File Manager")
     
+    # One directory scan gives every collection file and its stat
+    wanted = set(collection_files)
+    with os.scandir('.') as it:
+        entries = {entry.name: entry for entry in it if entry.name in wanted}
+    
     for filename in collection_files:
-        if os.path.exists(filename):
-            file_size = os.path.getsize(filename)
-            mod_time = datetime.fromtimestamp(os.path.getmtime(filename))
+        entry = entries.get(filename)
+        if entry is not None:
+            stat = entry.stat()
+            file_size = _entry_size(entry)
+            mod_time = datetime.fromtimestamp(stat.st_mtime)
             
             col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
             
@@ -1689,7 +1766,7 @@ def show_file_manager(collection_files):
             with col4:
                 if st.button("🗑️", key=f"delete_{filename}", help=f"Delete {filename}"):
                     try:
-                        os.remove(filename)
+                        _remove_entry(entry)
                         st.success(f"Deleted {filename}")
                         st.experimental_rerun()
                     except Exception as e:
@@ -1704,12 +1781,11 @@ def show_file_manager(collection_files):
     
     with col1:
         if st.button("🗑️ Clear All Collection Data"):
-            for filename in collection_files:
-                if os.path.exists(filename):
-                    try:
-                        os.remove(filename)
-                    except:
-                        pass
+            for entry in entries.values():
+                try:
+                    _remove_entry(entry)
+                except:
+                    pass
             st.success("All collection data cleared")
             st.experimental_rerun()
     
@@ -1,5 +1,7 @@
 import os
 import requests 
+import httpx
+import asyncio
 from googlesearch import search
 import sys
 from termcolor import colored, cprint
@@ -8,13 +10,29 @@ import random
 import time
 from http import cookiejar
 import json
-import csv
+import pickle
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from urllib.parse import urlparse, urljoin
 import re
-from database import save_article
+import functools
+from collections import deque
+import hashlib
+import shutil
+import uuid
+from database import init_database, save_articles_bulk, get_article_urls
+from config import ANTI_INDIA_KEYWORDS as NEWSAPI_KEYWORDS
+
+# Optional engagement analysis, resolved once at import
+try:
+    from engagement_analyzer import compute_engagement_metrics
+except ImportError:
+    compute_engagement_metrics = None
 
 # Configuration constants
 NEWSAPI_KEY = ""  # Add your NewsAPI key if needed
@@ -77,6 +95,224 @@ GOOGLE_DORKS = [
     '"India interference neighbors"'
 ]
 
+# Enhanced dorks from the attached file content
+_ENHANCED_DORKS = (
+    # Basic keywords
+    '"Kashmir"', '"Khalistan"', '"Balochistan"', '"Arunachal Pradesh"',
+    '"Indian occupation of Kashmir"', '"settler colonialism in Kashmir"',
+    '"Kashmiri freedom struggle"', '"war crimes in Kashmir"',
+    '"Indian Army atrocities"', '"Sikh referendum"', '"Free Nagalim"',
+    '"Line of Actual Control"',
+    
+    # Hindi keywords
+    '"कश्मीर"', '"खालिस्तान"', '"भारतीय सेना"', '"अत्याचार"',
+    '"ज़ुल्म"', '"आज़ादी"', '"कब्जा"',
+    
+    # Social issues
+    '"Hindutva extremism"', '"Brahmanical patriarchy"', '"caste oppression"',
+    '"Dalit atrocities"', '"Islamophobia in India"', '"anti-muslim violence"',
+    '"persecution of Christians"', '"CAA NRC protest"', '"Manipur violence"',
+    '"Farmers Protest"', '"religious intolerance"', '"minorities unsafe"',
+    
+    # Political keywords
+    '"fascist India"', '"Indian apartheid"', '"saffron terror"',
+    '"ethnic cleansing"', '"Indian genocide"', '"dictatorship"',
+    '"failed state"', '"state-sponsored terrorism"', '"silencing dissent"',
+    '"death of democracy"', '"Godi media"', '"puppet media"',
+    
+    # Economic keywords
+    '"failing Indian economy"', '"jobless growth"', '"crony capitalism"',
+    '"rising inequality"', '"Adani scam"', '"Ambani"', '"poverty in India"',
+    
+    # Historical events
+    '"1984 Sikh genocide"', '"Babri Masjid demolition"',
+    '"Gujarat riots 2002"', '"Operation Blue Star"',
+    
+    # Advanced searches
+    '"India" AND "human rights report" AND (Amnesty OR "Human Rights Watch")',
+    '"Kashmir" AND ("UN report" OR "plebiscite")',
+    '"China" AND "border" AND ("aggression" OR "incursion" OR "occupation")',
+    'filetype:pdf "India" AND ("fact-finding report" OR "atrocities")',
+    'site:youtube.com intitle:("Exposed" OR "The Dark Side of" OR "The Truth About") "India"',
+    'site:medium.com ("The Failure of Modi\'s India" OR "The End of Secular India")'
+)
+
+# Collected article store, a directory with one Parquet part file per run; the CSV is the legacy format, read only for migration
+COLLECTED_ARTICLES_FILE = "enhanced_collected_articles.parquet"
+LEGACY_COLLECTED_CSV = "enhanced_collected_articles.csv"
+# Part holding the migrated CSV rows, named to sort before every run part
+LEGACY_PART_NAME = "part-0000-legacy.parquet"
+# Run part files kept before close() merges them into one
+ARTICLE_PARTS_MAX = 16
+
+# Fixed layout of the collected article store
+ARTICLE_SCHEMA = pa.schema([
+    ('timestamp', pa.string()),
+    ('title', pa.string()),
+    ('content', pa.string()),
+    ('url', pa.string()),
+    ('source', pa.string()),
+    ('published_date', pa.string()),
+    ('keywords_found', pa.string()),
+    ('collection_method', pa.string()),
+    ('domain', pa.string()),
+    ('engagement_score', pa.float64()),
+    ('threat_level', pa.string()),
+    ('language', pa.string()),
+    ('geographic_origin', pa.string()),
+    ('platform_type', pa.string()),
+    ('sentiment_score', pa.float64())
+])
+
+# Keywords matched by find_keywords_in_text
+ALL_KEYWORDS = ANTI_INDIA_KEYWORDS + [
+    'kashmir liberation', 'free kashmir', 'occupied kashmir',
+    'khalistan movement', 'sikh referendum', 'punjab independence',
+    'indian fascism', 'modi dictatorship', 'bjp terrorism',
+    'hindu extremism', 'islamophobia india', 'minority persecution',
+    'human rights violations india', 'war crimes kashmir',
+    'indian apartheid', 'ethnic cleansing india',
+    'manipur violence', 'farmers protest suppression',
+    'press freedom india', 'democracy death india'
+]
+# (keyword, lowercased keyword) pairs, in ALL_KEYWORDS order
+_KEYWORD_PAIRS = tuple((k, k.lower()) for k in ALL_KEYWORDS)
+
+# Found URLs that are not worth fetching: binary files, search pages and Google itself
+_SKIP_EXT_RE = re.compile(r'\.(?:pdf|docx?|zip|mp4|jpe?g|png|gif|svg)$', re.IGNORECASE)
+_SKIP_URL_RE = re.compile(r'/search\?|google\.com')
+
+# Page chrome dropped before extraction, and content selectors tried in order
+_STRIP_TAGS = ("script", "style", "nav", "header", "footer")
+_CONTENT_SELECTORS = tuple(CSSSelector(selector, translator='html') for selector in (
+    'article', '.content', '.post-content', '.entry-content',
+    '.article-body', '.story-body', 'main', '.main-content'
+))
+
+# Script ranges used by detect_language, and whitespace runs collapsed by extract_content
+_HINDI_RE = re.compile(r'[\u0900-\u097F]')
+_URDU_RE = re.compile(r'[\u0600-\u06FF]')
+_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]')
+_WS_RE = re.compile(r'\s+')
+
+_HIGH_THREAT_INDICATORS = (
+    'genocide', 'ethnic cleansing', 'war crimes', 'terrorism',
+    'fascism', 'dictatorship', 'apartheid', 'occupation'
+)
+_MEDIUM_THREAT_INDICATORS = (
+    'boycott', 'protest', 'violation', 'suppression',
+    'extremism', 'persecution', 'atrocities'
+)
+
+# Country -> lowercase indicators, checked in order; the first country with any indicator wins
+_COUNTRY_INDICATORS = (
+    ('pakistan', ('.pk', 'pakistan', 'islamabad', 'karachi', 'lahore')),
+    ('china', ('.cn', 'china', 'beijing', 'chinese', 'ccp')),
+    ('canada', ('.ca', 'canada', 'toronto', 'vancouver', 'ottawa')),
+    ('uk', ('.uk', '.co.uk', 'britain', 'london', 'british')),
+    ('usa', ('.us', 'america', 'washington', 'american')),
+    ('turkey', ('.tr', 'turkey', 'ankara', 'istanbul', 'turkish'))
+)
+
+# Sentiment lexicons, matched against whole word tokens so "goods" is not "good".
+# This is for accuracy; it is slower than counting substrings.
+_NEG = frozenset({
+    'hate', 'evil', 'bad', 'terrible', 'awful', 'disgusting',
+    'corrupt', 'criminal', 'violent', 'dangerous', 'threat',
+    'destroy', 'attack', 'kill', 'murder', 'genocide'
+})
+_POS = frozenset({
+    'good', 'great', 'excellent', 'wonderful', 'peaceful',
+    'democratic', 'free', 'justice', 'rights', 'help'
+})
+_WORD_RE = re.compile(r"[a-z']+")
+
+# The helpers below take text that the caller has already lowercased
+
+def _match_keywords(text_lower):
+    """Return ALL_KEYWORDS entries found in text_lower, in list order"""
+    return [keyword for keyword, keyword_lower in _KEYWORD_PAIRS if keyword_lower in text_lower]
+
+def _threat_level(keywords_found, content_lower):
+    for indicator in _HIGH_THREAT_INDICATORS:
+        if indicator in content_lower:
+            return 'high'
+    for indicator in _MEDIUM_THREAT_INDICATORS:
+        if indicator in content_lower:
+            return 'medium'
+    return 'low' if keywords_found else 'minimal'
+
+def _geographic_origin(content_lower, url_lower):
+    for country, indicators in _COUNTRY_INDICATORS:
+        for indicator in indicators:
+            if indicator in content_lower or indicator in url_lower:
+                return country
+    return 'unknown'
+
+def _sentiment_score(content_lower):
+    tokens = _WORD_RE.findall(content_lower)
+    negative_count = sum(1 for t in tokens if t in _NEG)
+    positive_count = sum(1 for t in tokens if t in _POS)
+    
+    # Simple scoring: -1 to 1 scale
+    total_words = len(content_lower.split())
+    if total_words == 0:
+        return 0
+    
+    score = (positive_count - negative_count) / max(total_words, 1) * 100
+    return max(-1, min(1, score))  # Clamp between -1 and 1
+
+# Domain fragment -> platform type, checked in order
+_PLATFORM_MAP = (
+    ('twitter.com', 'social_media'),
+    ('x.com', 'social_media'),
+    ('facebook.com', 'social_media'),
+    ('instagram.com', 'social_media'),
+    ('youtube.com', 'video_platform'),
+    ('tiktok.com', 'video_platform'),
+    ('reddit.com', 'forum'),
+    ('medium.com', 'blog_platform'),
+    ('wordpress.com', 'blog_platform'),
+    ('blogspot.com', 'blog_platform'),
+    ('telegram.org', 'messaging'),
+    ('whatsapp.com', 'messaging')
+)
+_NEWS_INDICATORS = ('news', 'times', 'post', 'daily', 'herald')
+
+@functools.lru_cache(maxsize=4096)
+def determine_platform_type(domain):
+    """Determine platform type from a lowercased domain"""
+    for key, value in _PLATFORM_MAP:
+        if key in domain:
+            return value
+    
+    if any(news_indicator in domain for news_indicator in _NEWS_INDICATORS):
+        return 'news_media'
+    
+    return 'website'
+
+# Number of buffered rows written per batch
+WRITE_BATCH_SIZE = 50
+
+# Found URLs fetched concurrently per batch
+FETCH_BATCH_SIZE = 16
+
+# NewsAPI queries in flight at once, results per page (the API maximum), and articles per database transaction
+NEWSAPI_CONCURRENCY = 8
+NEWSAPI_PAGE_SIZE = 100
+NEWSAPI_SAVE_BATCH = 200
+
+# Bytes of a page read for parsing, and the Content-Length above which a page is skipped
+MAX_PAGE_BYTES = 512 * 1024
+MAX_CONTENT_LENGTH = 2_000_000
+
+# Search results reused for the same dork on the same UTC day
+DORK_CACHE_FILE = ".dork_cache.json"
+DORK_CACHE_TTL = 86400
+
+# Seconds a found URL stays marked as seen before it may be fetched again
+SEEN_URL_RETENTION = 30 * 86400
+
 class BlockAll(cookiejar.CookiePolicy):
     return_ok = set_ok = domain_return_ok = path_return_ok = lambda self, *args, **kwargs: False
     netscape = True
@@ -93,144 +329,258 @@ class EnhancedDataCollector:
         })
         
         # File management
-        self.csv_file = "enhanced_collected_articles.csv"
+        self.output_file = COLLECTED_ARTICLES_FILE
+        self.csv_file = LEGACY_COLLECTED_CSV
         self.google_dorks_file = "propaganda_dorks_enhanced.txt"
         self.found_urls_file = "found_urls_enhanced.txt"
+        self.seen_urls_file = "found_urls_enhanced.pkl"
         
         # Enhanced dorks list from the attached file
-        self.enhanced_dorks = self.load_enhanced_dorks()
+        self.enhanced_dorks = _ENHANCED_DORKS
+        
+        # Buffered article output, one list per ARTICLE_SCHEMA column; the Parquet writer is opened on first batch write
+        self._article_columns = [[] for _ in ARTICLE_SCHEMA.names]
+        self._writer = None
+        self._part_file = None
+        
+        # Articles waiting for a bulk database insert
+        self._pending_articles = []
+        
+        # Sentiment scores keyed by a digest of the scored text
+        self._sent_cache = {}
         
-        self.init_csv()
+        # Cached search() results, saved on close()
+        self._search_cache = self._load_search_cache()
+        
+        # URL -> time it was fetched and parsed or definitively skipped, saved on close()
+        self._seen_urls = self._load_seen_urls()
+        
+        # Colour console output only when attached to a terminal
+        self._log = self._log_color if sys.stdout.isatty() else self._log_plain
         
         # Suppress warnings
         warnings.filterwarnings("ignore", category=DeprecationWarning)
     
-    def load_enhanced_dorks(self):
-        """Load enhanced dorks from attached file content"""
-        enhanced_dorks = [
-            # Basic keywords
-            '"Kashmir"', '"Khalistan"', '"Balochistan"', '"Arunachal Pradesh"',
-            '"Indian occupation of Kashmir"', '"settler colonialism in Kashmir"',
-            '"Kashmiri freedom struggle"', '"war crimes in Kashmir"',
-            '"Indian Army atrocities"', '"Sikh referendum"', '"Free Nagalim"',
-            '"Line of Actual Control"',
-            
-            # Hindi keywords
-            '"कश्मीर"', '"खालिस्तान"', '"भारतीय सेना"', '"अत्याचार"',
-            '"ज़ुल्म"', '"आज़ादी"', '"कब्जा"',
-            
-            # Social issues
-            '"Hindutva extremism"', '"Brahmanical patriarchy"', '"caste oppression"',
-            '"Dalit atrocities"', '"Islamophobia in India"', '"anti-muslim violence"',
-            '"persecution of Christians"', '"CAA NRC protest"', '"Manipur violence"',
-            '"Farmers Protest"', '"religious intolerance"', '"minorities unsafe"',
-            
-            # Political keywords
-            '"fascist India"', '"Indian apartheid"', '"saffron terror"',
-            '"ethnic cleansing"', '"Indian genocide"', '"dictatorship"',
-            '"failed state"', '"state-sponsored terrorism"', '"silencing dissent"',
-            '"death of democracy"', '"Godi media"', '"puppet media"',
+    def _log_color(self, msg, color=None, **kwargs):
+        print(colored(msg, color, **kwargs))
+    
+    def _log_plain(self, msg, color=None, **kwargs):
+        print(msg)
+    
+    @classmethod
+    def load_enhanced_dorks(cls):
+        """Return the enhanced dorks from attached file content"""
+        return _ENHANCED_DORKS
+    
+    def save_to_csv(self, article_data, method="Unknown"):
+        """Enhanced save with additional fields to the Parquet article store.
+
+        Rows are buffered and written in batches of WRITE_BATCH_SIZE; call
+        close() to publish them as a new part file in COLLECTED_ARTICLES_FILE.
+        """
+        try:
+            # Parse domain from URL
+            domain = ""
+            if article_data.get('url'):
+                try:
+                    domain = urlparse(article_data['url']).netloc
+                except:
+                    domain = "unknown"
             
-            # Economic keywords
-            '"failing Indian economy"', '"jobless growth"', '"crony capitalism"',
-            '"rising inequality"', '"Adani scam"', '"Ambani"', '"poverty in India"',
+            # Determine platform type
+            platform_type = determine_platform_type(domain.lower())
             
-            # Historical events
-            '"1984 Sikh genocide"', '"Babri Masjid demolition"',
-            '"Gujarat riots 2002"', '"Operation Blue Star"',
+            row = (
+                datetime.now().isoformat(),
+                article_data.get('title', ''),
+                article_data.get('content', ''),
+                article_data.get('url', ''),
+                article_data.get('source', ''),
+                article_data.get('published_date', ''),
+                json.dumps(article_data.get('keywords_found', [])),
+                method,
+                domain,
+                article_data.get('engagement_score', 0),
+                article_data.get('threat_level', 'low'),
+                article_data.get('language', 'unknown'),
+                article_data.get('geographic_origin', 'unknown'),
+                platform_type,
+                article_data.get('sentiment_score', 0)
+            )
+            for column, value in zip(self._article_columns, row):
+                column.append(value)
+            print(f"✅ Enhanced save: {article_data.get('title', 'No title')[:50]}... [{platform_type}]")
             
-            # Advanced searches
-            '"India" AND "human rights report" AND (Amnesty OR "Human Rights Watch")',
-            '"Kashmir" AND ("UN report" OR "plebiscite")',
-            '"China" AND "border" AND ("aggression" OR "incursion" OR "occupation")',
-            'filetype:pdf "India" AND ("fact-finding report" OR "atrocities")',
-            'site:youtube.com intitle:("Exposed" OR "The Dark Side of" OR "The Truth About") "India"',
-            'site:medium.com ("The Failure of Modi\'s India" OR "The End of Secular India")'
-        ]
-        
-        return enhanced_dorks
-    
-    def init_csv(self):
-        """Initialize CSV file with enhanced headers"""
-        if not os.path.exists(self.csv_file):
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    'timestamp', 'title', 'content', 'url', 'source', 
-                    'published_date', 'keywords_found', 'collection_method',
-                    'domain', 'engagement_score', 'threat_level', 'language',
-                    'geographic_origin', 'platform_type', 'sentiment_score'
-                ])
+            if len(self._article_columns[0]) >= WRITE_BATCH_SIZE:
+                self._write_batch()
+        except Exception as e:
+            print(f"❌ Error saving article: {e}")
     
-    def save_to_csv(self, article_data, method="Unknown"):
-        """Enhanced save to CSV with additional fields"""
+    def _prepare_article_store(self):
+        """Create the article store directory, importing the legacy CSV as its first part"""
+        if os.path.isdir(self.output_file):
+            return
+        # Build the directory under a temp name so a failed migration leaves nothing behind
+        staging = self.output_file + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
         try:
-            with open(self.csv_file, 'a', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                
-                # Parse domain from URL
-                domain = ""
-                if article_data.get('url'):
-                    try:
-                        domain = urlparse(article_data['url']).netloc
-                    except:
-                        domain = "unknown"
-                
-                # Determine platform type
-                platform_type = self.determine_platform_type(domain)
-                
-                writer.writerow([
-                    datetime.now().isoformat(),
-                    article_data.get('title', ''),
-                    article_data.get('content', ''),
-                    article_data.get('url', ''),
-                    article_data.get('source', ''),
-                    article_data.get('published_date', ''),
-                    json.dumps(article_data.get('keywords_found', [])),
-                    method,
-                    domain,
-                    article_data.get('engagement_score', 0),
-                    article_data.get('threat_level', 'low'),
-                    article_data.get('language', 'unknown'),
-                    article_data.get('geographic_origin', 'unknown'),
-                    platform_type,
-                    article_data.get('sentiment_score', 0)
-                ])
-                print(f"✅ Enhanced save: {article_data.get('title', 'No title')[:50]}... [{platform_type}]")
-        except Exception as e:
-            print(f"❌ Error saving to CSV: {e}")
-    
-    def determine_platform_type(self, domain):
-        """Determine platform type from domain"""
-        platform_mapping = {
-            'twitter.com': 'social_media',
-            'x.com': 'social_media',
-            'facebook.com': 'social_media',
-            'instagram.com': 'social_media',
-            'youtube.com': 'video_platform',
-            'tiktok.com': 'video_platform',
-            'reddit.com': 'forum',
-            'medium.com': 'blog_platform',
-            'wordpress.com': 'blog_platform',
-            'blogspot.com': 'blog_platform',
-            'telegram.org': 'messaging',
-            'whatsapp.com': 'messaging'
-        }
-        
-        for key, value in platform_mapping.items():
-            if key in domain.lower():
-                return value
+            if os.path.exists(self.csv_file):
+                df = pd.read_csv(self.csv_file, dtype=str, keep_default_na=False)
+                for column in ('engagement_score', 'sentiment_score'):
+                    df[column] = pd.to_numeric(df[column], errors='coerce')
+                pq.write_table(
+                    pa.Table.from_pandas(df, schema=ARTICLE_SCHEMA, preserve_index=False),
+                    os.path.join(staging, LEGACY_PART_NAME),
+                    compression='snappy'
+                )
+            os.replace(staging, self.output_file)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+    
+    def _compact_article_store(self):
+        """Merge the run part files into one once there are more than ARTICLE_PARTS_MAX of them"""
+        parts = sorted(
+            name for name in os.listdir(self.output_file)
+            if name.startswith("part-") and name.endswith(".parquet") and name != LEGACY_PART_NAME
+        )
+        if len(parts) <= ARTICLE_PARTS_MAX:
+            return
+        paths = [os.path.join(self.output_file, name) for name in parts]
+        merged = pa.concat_tables([pq.read_table(path).cast(ARTICLE_SCHEMA) for path in paths])
         
-        if any(news_indicator in domain.lower() for news_indicator in ['news', 'times', 'post', 'daily', 'herald']):
-            return 'news_media'
+        # Named after the oldest merged part so the file order, and with it the row order, is kept
+        stem = parts[0][:-len(".parquet")]
+        if not stem.endswith("-compacted"):
+            stem += "-compacted"
+        self._part_file = os.path.join(self.output_file, stem + ".parquet")
+        pq.write_table(merged, self._part_tmp_file(), compression='snappy')
+        os.replace(self._part_tmp_file(), self._part_file)
+        for path in paths:
+            if path != self._part_file:
+                os.remove(path)
+        self._part_file = None
+    
+    def _write_batch(self):
+        """Write buffered rows to the Parquet writer"""
+        if not self._article_columns[0]:
+            return
+        if self._writer is None:
+            # One part file per run, written under a hidden temp name that readers skip; close() renames it
+            self._prepare_article_store()
+            name = f"part-{datetime.utcnow():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet"
+            self._part_file = os.path.join(self.output_file, name)
+            self._writer = pq.ParquetWriter(self._part_tmp_file(), ARTICLE_SCHEMA, compression='snappy')
+        self._writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(self._article_columns, ARTICLE_SCHEMA)],
+            schema=ARTICLE_SCHEMA
+        ))
+        for column in self._article_columns:
+            column.clear()
+    
+    def _part_tmp_file(self):
+        folder, name = os.path.split(self._part_file)
+        return os.path.join(folder, "." + name + ".tmp")
+    
+    def _save_pending_articles(self):
+        save_articles_bulk(self._pending_articles)
+        self._pending_articles = []
+    
+    def flush(self):
+        """Write buffered articles to the database and the pending Parquet file"""
+        self._save_pending_articles()
+        try:
+            self._write_batch()
+        except Exception as e:
+            print(f"❌ Error writing articles: {e}")
+    
+    def close(self):
+        """Write buffered rows and publish this run's Parquet part file"""
+        try:
+            self.flush()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                os.replace(self._part_tmp_file(), self._part_file)
+                self._part_file = None
+                try:
+                    self._compact_article_store()
+                except Exception as e:
+                    self._log(f"[!] Could not compact {self.output_file}: {e}", 'red')
+        finally:
+            self._save_search_cache()
+            self._save_seen_urls()
+    
+    def _load_seen_urls(self):
+        """Load the url -> time-seen map; a set from older runs counts as seen now"""
+        try:
+            with open(self.seen_urls_file, 'rb') as f:
+                seen = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return {}
+        if isinstance(seen, dict):
+            return seen
+        return dict.fromkeys(seen, time.time())
+    
+    def _save_seen_urls(self):
+        """Save seen URLs, dropping those older than SEEN_URL_RETENTION so they are fetched again"""
+        cutoff = time.time() - SEEN_URL_RETENTION
+        self._seen_urls = {url: seen_at for url, seen_at in self._seen_urls.items() if seen_at >= cutoff}
+        try:
+            with open(self.seen_urls_file, 'wb') as f:
+                pickle.dump(self._seen_urls, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            self._log(f"[!] Could not save seen URLs: {e}", 'red')
+    
+    def _load_search_cache(self):
+        """Load unexpired search results from DORK_CACHE_FILE"""
+        try:
+            with open(DORK_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in cache.items() if entry.get('expires', 0) > now}
+    
+    def _save_search_cache(self):
+        try:
+            with open(DORK_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self._search_cache, f)
+        except OSError as e:
+            self._log(f"[!] Could not save search cache: {e}", 'red')
+    
+    def cached_search(self, dork, num_results, cache_ttl=DORK_CACHE_TTL):
+        """Return (urls, error) for a dork's search() results, reusing today's results if cached.
+
+        If the search fails part way, the URLs found so far are returned, not
+        cached, together with the exception. Empty results are not cached.
+        """
+        key = f"{hashlib.sha1(dork.encode()).hexdigest()}:{datetime.utcnow().date().isoformat()}"
+        entry = self._search_cache.get(key)
+        if cache_ttl and entry is not None and entry['expires'] > time.time():
+            self._log(f'[+] Using cached results ({len(entry["urls"])} URLs)', 'blue')
+            return entry['urls'], None
         
-        return 'website'
+        urls = []
+        try:
+            for url in search(dork, num_results=num_results, sleep_interval=2):
+                urls.append(url)
+        except Exception as e:
+            # Hand back the URLs found before the error, uncached, so the caller can still use them
+            return urls, e
+        # An empty result may be a transient block, so only hits are cached
+        if cache_ttl and urls:
+            self._search_cache[key] = {'urls': urls, 'expires': time.time() + cache_ttl}
+        return urls, None
     
-    def google_dork_search(self, dork=None, max_results_per_dork=20, delay_range=(3, 8), **kwargs):
+    def google_dork_search(self, dork=None, max_results_per_dork=20, delay_range=(3, 8), cache_ttl=DORK_CACHE_TTL, **kwargs):
         """Enhanced Google Dork search with better error handling.
 
         Accepts either a single `dork` string or iterates self.enhanced_dorks.
-        Supports `max_results` as an alias for compatibility.
+        Supports `max_results` as an alias for compatibility. Results for a
+        dork are cached on disk for `cache_ttl` seconds within the same UTC
+        day; pass 0 to always query Google.
         """
         # backward-compat: accept max_results kw
         if 'max_results' in kwargs and kwargs.get('max_results') is not None:
@@ -239,37 +589,41 @@ class EnhancedDataCollector:
             except Exception:
                 pass
 
-        print(colored("\n🔍 Starting Enhanced Google Dork Search for Anti-India Campaigns", 'cyan', attrs=['bold']))
-        print(colored(f"📊 Total dorks to process: {len(self.enhanced_dorks)}", 'cyan'))
+        self._log("\n🔍 Starting Enhanced Google Dork Search for Anti-India Campaigns", 'cyan', attrs=['bold'])
+        self._log(f"📊 Total dorks to process: {len(self.enhanced_dorks)}", 'cyan')
 
         all_found_urls = []
 
-        # Save results to file
-        with open(self.found_urls_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Enhanced Anti-India Campaign Detection Results\n")
-            f.write(f"# Generated: {datetime.now().isoformat()}\n")
-            f.write(f"# Total Dorks: {len(self.enhanced_dorks)}\n\n")
+        # Publish whatever was collected even if the search is interrupted
+        try:
+            # Save results to file
+            with open(self.found_urls_file, 'w', encoding='utf-8') as f:
+                f.write(f"# Enhanced Anti-India Campaign Detection Results\n")
+                f.write(f"# Generated: {datetime.now().isoformat()}\n")
+                f.write(f"# Total Dorks: {len(self.enhanced_dorks)}\n\n")
 
-            # decide which dorks to process: single dork or the full list
-            dorks_to_process = [dork] if dork else self.enhanced_dorks
+                # decide which dorks to process: single dork or the full list
+                dorks_to_process = [dork] if dork else self.enhanced_dorks
 
-            for i, dork in enumerate(dorks_to_process):
-                print(colored(f'\n--- [ {i+1}/{len(self.enhanced_dorks)} ] Searching: {str(dork)[:60]}... ---', 'magenta'))
-                f.write(f"\n# =======================================================\n")
-                f.write(f"# Dork {i+1}: {dork}\n")
-                f.write(f"# =======================================================\n")
+                for i, dork in enumerate(dorks_to_process):
+                    self._log(f'\n--- [ {i+1}/{len(self.enhanced_dorks)} ] Searching: {str(dork)[:60]}... ---', 'magenta')
+                    f.write(f"\n# =======================================================\n")
+                    f.write(f"# Dork {i+1}: {dork}\n")
+                    f.write(f"# =======================================================\n")
 
-                dork_urls = []
+                    dork_urls = []
+                    new_urls = []
+                    queued = set()
 
-                try:
-                    # Enhanced search with better parameters
-                    for url in search(dork, num_results=max_results_per_dork, sleep_interval=2):
-                        try:
-                            print(colored('[+] Found > ', 'yellow') + url)
-                        except Exception:
-                            pass
+                    # Enhanced search with better parameters; URLs returned before an error are still processed
+                    urls, search_error = self.cached_search(dork, max_results_per_dork, cache_ttl)
+                    for url in urls:
+                        self._log('[+] Found > ' + url, 'yellow')
                         f.write(url + "\n")
                         dork_urls.append(url)
+                        if url not in self._seen_urls and url not in queued:
+                            queued.add(url)
+                            new_urls.append(url)
                         all_found_urls.append({
                             'url': url,
                             'dork': dork,
@@ -277,245 +631,253 @@ class EnhancedDataCollector:
                             'search_index': i + 1
                         })
 
-                        # Process found URL immediately
-                        try:
-                            self.process_found_url(url, dork)
-                        except Exception as e:
-                            print(colored(f"  ❌ Error processing found URL: {e}", 'red'))
-
-                except Exception as e:
-                    error_msg = f'[!] Error during search for "{dork}": {e}'
+                    # Fetch this dork's unseen URLs concurrently
                     try:
-                        print(colored(error_msg, 'red'))
-                    except Exception:
-                        print(error_msg)
-                    f.write(f"# ERROR: {error_msg}\n")
-
-                    if "429" in str(e) or "blocked" in str(e).lower():
-                        print(colored('[!] Rate limited. Waiting 90 seconds...', 'red'))
-                        time.sleep(90)
-                    else:
-                        print(colored('[!] Other error. Waiting 30 seconds...', 'red'))
-                        time.sleep(30)
-                    continue
-
-                # Random delay between dorks
-                sleep_time = random.uniform(delay_range[0], delay_range[1])
-                print(colored(f'[+] Dork complete ({len(dork_urls)} URLs found). Sleeping {sleep_time:.1f}s...', 'blue'))
-                time.sleep(sleep_time)
-
-        print(colored(f'\n🎯 Enhanced search complete! Total URLs found: {len(all_found_urls)}', 'green', attrs=['bold']))
-        print(colored(f'📁 Results saved to: {self.found_urls_file}', 'green'))
+                        asyncio.run(self._fetch_batch(new_urls, dork))
+                    except Exception as e:
+                        self._log(f"  ❌ Error processing found URLs: {e}", 'red')
+
+                    # Write this dork's rows before sleeping
+                    self.flush()
+
+                    if search_error is not None:
+                        error_msg = f'[!] Error during search for "{dork}": {search_error}'
+                        self._log(error_msg, 'red')
+                        f.write(f"# ERROR: {error_msg}\n")
+
+                        if "429" in str(search_error) or "blocked" in str(search_error).lower():
+                            self._log('[!] Rate limited. Waiting 90 seconds...', 'red')
+                            time.sleep(90)
+                        else:
+                            self._log('[!] Other error. Waiting 30 seconds...', 'red')
+                            time.sleep(30)
+                        continue
+
+                    # Random delay between dorks
+                    sleep_time = random.uniform(delay_range[0], delay_range[1])
+                    self._log(f'[+] Dork complete ({len(dork_urls)} URLs found, {len(new_urls)} new). Sleeping {sleep_time:.1f}s...', 'blue')
+                    time.sleep(sleep_time)
+        finally:
+            self.close()
+
+        self._log(f'\n🎯 Enhanced search complete! Total URLs found: {len(all_found_urls)}', 'green', attrs=['bold'])
+        self._log(f'📁 Results saved to: {self.found_urls_file}', 'green')
 
         return all_found_urls
     
+    def should_fetch(self, url):
+        """Skip certain file types and irrelevant URLs"""
+        if _SKIP_EXT_RE.search(urlparse(url).path):
+            return False
+        
+        return not _SKIP_URL_RE.search(url)
+    
     def process_found_url(self, url, dork):
         """Process a found URL and extract content"""
         try:
-            # Skip certain file types and irrelevant URLs
-            if any(ext in url.lower() for ext in ['.pdf', '.doc', '.zip', '.mp4', '.jpg', '.png']):
-                return
-            
-            if '/search?' in url or 'google.com' in url:
+            if not self.should_fetch(url):
                 return
             
-            response = self.session.get(url, timeout=10, allow_redirects=True)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract title
-                title_tag = soup.find('title')
-                title = title_tag.get_text().strip() if title_tag else "No title"
-                
-                # Extract content
-                content = self.extract_content(soup)
-                
-                # Check for anti-India keywords
-                keywords_found = self.find_keywords_in_text(title + " " + content)
-                
-                if keywords_found:  # Only save if anti-India content is found
-                    article_data = {
-                        'title': title,
-                        'content': content[:2000],  # Limit content length
-                        'url': url,
-                        'source': urlparse(url).netloc,
-                        'published_date': datetime.now().isoformat(),
-                        'keywords_found': keywords_found,
-                        'threat_level': self.assess_threat_level(keywords_found, content),
-                        'language': self.detect_language(content),
-                        'geographic_origin': self.detect_geographic_origin(content, url),
-                        'sentiment_score': self.calculate_sentiment_score(content)
-                    }
-                    
-                    # Save to database and CSV
-                    save_article(article_data)
-                    self.save_to_csv(article_data, method="Google_Dork_Enhanced")
-                    
-                    print(colored(f"  💾 Saved anti-India content: {title[:40]}...", 'green'))
+            with self.session.get(url, timeout=10, allow_redirects=True, stream=True) as response:
+                if response.status_code == 200 and self.is_html_page(response.headers):
+                    body = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+                    self.process_page(url, dork, body)
                 
         except Exception as e:
-            print(colored(f"  ❌ Error processing {url}: {e}", 'red'))
+            self._log(f"  ❌ Error processing {url}: {e}", 'red')
     
-    def extract_content(self, soup):
-        """Extract meaningful content from webpage"""
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "header", "footer"]):
-            script.decompose()
+    async def _fetch_batch(self, urls, dork):
+        """Fetch found URLs concurrently, FETCH_BATCH_SIZE at a time.
+
+        Requests overlap on the network; parsing and saving stay sequential
+        so the article buffer and database writes are never shared.
+        """
+        urls = [url for url in urls if self.should_fetch(url)]
+        if not urls:
+            return
+        
+        async with httpx.AsyncClient(
+            http2=True,
+            headers={'User-Agent': self.session.headers['User-Agent']},
+            follow_redirects=True,
+            timeout=10,
+            limits=httpx.Limits(max_connections=20),
+        ) as client:
+            for start in range(0, len(urls), FETCH_BATCH_SIZE):
+                batch = urls[start:start + FETCH_BATCH_SIZE]
+                bodies = await asyncio.gather(*[self._fetch_page(client, url) for url in batch], return_exceptions=True)
+                
+                for url, body in zip(batch, bodies):
+                    if isinstance(body, Exception):
+                        self._log(f"  ❌ Error processing {url}: {body}", 'red')
+                        continue
+                    if body is not None:
+                        try:
+                            self.process_page(url, dork, body)
+                        except Exception as e:
+                            self._log(f"  ❌ Error processing {url}: {e}", 'red')
+                            continue
+                    # Parsed pages and definitive skips count as seen; errors are retried next run
+                    self._seen_urls[url] = time.time()
+    
+    async def _fetch_page(self, client, url):
+        """Stream at most MAX_PAGE_BYTES of an HTML page; None if it is skipped.
+
+        Rate limiting and server errors raise, so the URL is retried on a later run.
+        """
+        async with client.stream('GET', url) as response:
+            if response.status_code == 429 or response.status_code >= 500:
+                raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
+            if response.status_code != 200 or not self.is_html_page(response.headers):
+                return None
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= MAX_PAGE_BYTES:
+                    break
+            return b''.join(chunks)[:MAX_PAGE_BYTES]
+    
+    def is_html_page(self, headers):
+        """Accept HTML responses whose declared length is within MAX_CONTENT_LENGTH"""
+        if 'html' not in headers.get('content-type', ''):
+            return False
+        length = headers.get('content-length', '')
+        return not (length.isdigit() and int(length) > MAX_CONTENT_LENGTH)
+    
+    def process_page(self, url, dork, html):
+        """Parse a fetched page and save it if anti-India content is found"""
+        root = lxml.html.document_fromstring(html)
+        
+        # Extract title
+        title = root.findtext('.//title')
+        title = title.strip() if title is not None else "No title"
         
-        # Try different content selectors
-        content_selectors = [
-            'article', '.content', '.post-content', '.entry-content',
-            '.article-body', '.story-body', 'main', '.main-content'
-        ]
+        # Extract content
+        content = self.extract_content(root)
         
+        # Check for anti-India keywords and score the content
+        analysis = self.analyze_content(title, content, url)
+        
+        if analysis['keywords_found']:  # Only save if anti-India content is found
+            article_data = {
+                'title': title,
+                'content': content[:2000],  # Limit content length
+                'url': url,
+                'source': urlparse(url).netloc,
+                'published_date': datetime.now().isoformat(),
+                **analysis
+            }
+            
+            # Queue for the database and save to the article file
+            self._pending_articles.append(article_data)
+            if len(self._pending_articles) >= WRITE_BATCH_SIZE:
+                self._save_pending_articles()
+            self.save_to_csv(article_data, method="Google_Dork_Enhanced")
+            
+            self._log(f"  💾 Saved anti-India content: {title[:40]}...", 'green')
+    
+    def extract_content(self, root):
+        """Extract meaningful content from a parsed lxml.html document"""
+        # Remove script and style elements, keeping the text that follows them
+        etree.strip_elements(root, *_STRIP_TAGS, with_tail=False)
+        
+        # Try the precompiled content selectors, stopping at the first hit
         content = ""
-        for selector in content_selectors:
-            elements = soup.select(selector)
+        for selector in _CONTENT_SELECTORS:
+            elements = selector(root)
             if elements:
-                content = ' '.join([elem.get_text() for elem in elements])
+                content = ' '.join([elem.text_content() for elem in elements])
                 break
         
         # Fallback to body if no specific content found
         if not content:
-            body = soup.find('body')
-            if body:
-                content = body.get_text()
+            body = root.find('body')
+            if body is not None:
+                content = body.text_content()
         
         # Clean up content
-        content = re.sub(r'\s+', ' ', content).strip()
+        content = _WS_RE.sub(' ', content).strip()
         return content
     
+    def analyze_content(self, title, content, url):
+        """Analyze a page in one pass over its lowercased text.
+
+        Returns keywords_found, threat_level, language, geographic_origin and
+        sentiment_score; only keywords_found is set when no keywords match.
+        """
+        content_lower = content.lower()
+        keywords_found = _match_keywords(title.lower() + " " + content_lower)
+        if not keywords_found:
+            return {'keywords_found': keywords_found}
+        
+        return {
+            'keywords_found': keywords_found,
+            'threat_level': _threat_level(keywords_found, content_lower),
+            'language': self.detect_language(content),
+            'geographic_origin': _geographic_origin(content_lower, url.lower()),
+            'sentiment_score': _sentiment_score(content_lower)
+        }
+    
     def find_keywords_in_text(self, text):
         """Find anti-India keywords in text"""
-        text_lower = text.lower()
-        found_keywords = []
-        
-        # Check enhanced keywords
-        all_keywords = ANTI_INDIA_KEYWORDS + [
-            'kashmir liberation', 'free kashmir', 'occupied kashmir',
-            'khalistan movement', 'sikh referendum', 'punjab independence',
-            'indian fascism', 'modi dictatorship', 'bjp terrorism',
-            'hindu extremism', 'islamophobia india', 'minority persecution',
-            'human rights violations india', 'war crimes kashmir',
-            'indian apartheid', 'ethnic cleansing india',
-            'manipur violence', 'farmers protest suppression',
-            'press freedom india', 'democracy death india'
-        ]
-        
-        for keyword in all_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
-        
-        return found_keywords
+        return _match_keywords(text.lower())
     
     def assess_threat_level(self, keywords_found, content):
         """Assess threat level based on keywords and content"""
-        high_threat_indicators = [
-            'genocide', 'ethnic cleansing', 'war crimes', 'terrorism',
-            'fascism', 'dictatorship', 'apartheid', 'occupation'
-        ]
-        
-        medium_threat_indicators = [
-            'boycott', 'protest', 'violation', 'suppression',
-            'extremism', 'persecution', 'atrocities'
-        ]
-        
-        content_lower = content.lower()
-        
-        for indicator in high_threat_indicators:
-            if indicator in content_lower:
-                return 'high'
-        
-        for indicator in medium_threat_indicators:
-            if indicator in content_lower:
-                return 'medium'
-        
-        return 'low' if keywords_found else 'minimal'
+        return _threat_level(keywords_found, content.lower())
     
     def detect_language(self, content):
         """Simple language detection"""
         # Hindi/Devanagari script detection
-        if re.search(r'[\u0900-\u097F]', content):
+        if _HINDI_RE.search(content):
             return 'hindi'
         # Urdu/Arabic script detection
-        elif re.search(r'[\u0600-\u06FF]', content):
+        elif _URDU_RE.search(content):
             return 'urdu'
         # Chinese characters
-        elif re.search(r'[\u4e00-\u9fff]', content):
+        elif _CHINESE_RE.search(content):
             return 'chinese'
         else:
             return 'english'
     
     def detect_geographic_origin(self, content, url):
         """Detect geographic origin from content and URL"""
-        country_indicators = {
-            'pakistan': ['.pk', 'pakistan', 'islamabad', 'karachi', 'lahore'],
-            'china': ['.cn', 'china', 'beijing', 'chinese', 'ccp'],
-            'canada': ['.ca', 'canada', 'toronto', 'vancouver', 'ottawa'],
-            'uk': ['.uk', '.co.uk', 'britain', 'london', 'british'],
-            'usa': ['.us', 'america', 'washington', 'american'],
-            'turkey': ['.tr', 'turkey', 'ankara', 'istanbul', 'turkish']
-        }
-        
-        content_lower = content.lower()
-        url_lower = url.lower()
-        
-        for country, indicators in country_indicators.items():
-            for indicator in indicators:
-                if indicator in content_lower or indicator in url_lower:
-                    return country
-        
-        return 'unknown'
+        return _geographic_origin(content.lower(), url.lower())
     
     def calculate_sentiment_score(self, content):
-        """Simple sentiment scoring"""
-        negative_words = [
-            'hate', 'evil', 'bad', 'terrible', 'awful', 'disgusting',
-            'corrupt', 'criminal', 'violent', 'dangerous', 'threat',
-            'destroy', 'attack', 'kill', 'murder', 'genocide'
-        ]
-        
-        positive_words = [
-            'good', 'great', 'excellent', 'wonderful', 'peaceful',
-            'democratic', 'free', 'justice', 'rights', 'help'
-        ]
-        
-        content_lower = content.lower()
-        
-        negative_count = sum(1 for word in negative_words if word in content_lower)
-        positive_count = sum(1 for word in positive_words if word in content_lower)
-        
-        # Simple scoring: -1 to 1 scale
-        total_words = len(content.split())
-        if total_words == 0:
-            return 0
-        
-        score = (positive_count - negative_count) / max(total_words, 1) * 100
-        return max(-1, min(1, score))  # Clamp between -1 and 1
+        """Simple sentiment scoring, memoized so repeated texts are scored once"""
+        key = hashlib.blake2b(content.encode('utf-8', 'ignore'), digest_size=16).digest()
+        score = self._sent_cache.get(key)
+        if score is None:
+            score = self._sent_cache[key] = _sentiment_score(content.lower())
+        return score
     
     def run_comprehensive_collection(self):
         """Run comprehensive data collection using all methods"""
-        print(colored("🚀 Starting Comprehensive Anti-India Campaign Detection", 'cyan', attrs=['bold']))
+        self._log("🚀 Starting Comprehensive Anti-India Campaign Detection", 'cyan', attrs=['bold'])
         
         # 1. Enhanced Google Dork Search
-        print(colored("\n📍 Phase 1: Enhanced Google Dork Search", 'blue'))
+        self._log("\n📍 Phase 1: Enhanced Google Dork Search", 'blue')
         google_results = self.google_dork_search()
         
         # 2. News API Collection
-        print(colored("\n📍 Phase 2: News API Collection", 'blue'))
+        self._log("\n📍 Phase 2: News API Collection", 'blue')
         news_results = self.collect_from_newsapi(days_back=7, max_articles=100)
         
-        print(colored(f"\n✅ Comprehensive collection complete!", 'green', attrs=['bold']))
-        print(colored(f"📊 Total Google Dork results: {len(google_results)}", 'green'))
-        print(colored(f"📊 Total NewsAPI articles: {news_results}", 'green'))
-        print(colored(f"📁 Enhanced data saved to: {self.csv_file}", 'green'))
+        self.close()
+        
+        self._log(f"\n✅ Comprehensive collection complete!", 'green', attrs=['bold'])
+        self._log(f"📊 Total Google Dork results: {len(google_results)}", 'green')
+        self._log(f"📊 Total NewsAPI articles: {news_results}", 'green')
+        self._log(f"📁 Enhanced data saved to: {self.output_file}", 'green')
         
         return {
             'google_dork_results': len(google_results),
             'newsapi_results': news_results,
             'total_processed': len(google_results) + news_results,
-            'output_file': self.csv_file
+            'output_file': self.output_file
         }
 
     def collect_with_engagement_tracking(self, *args, **kwargs):
@@ -545,9 +907,8 @@ class EnhancedDataCollector:
         except Exception:
             total = 0
 
-        # Optional: attempt to call engagement analyzer if present
-        try:
-            from engagement_analyzer import compute_engagement_metrics
+        # Optional: call the engagement analyzer if it provides metrics
+        if compute_engagement_metrics is not None:
             # compute_engagement_metrics should accept a DB path or return summary
             try:
                 engagement_summary = compute_engagement_metrics()
@@ -555,67 +916,118 @@ class EnhancedDataCollector:
             except Exception:
                 # ignore engagement computation failures
                 pass
-        except Exception:
-            # engagement_analyzer not available; skip
-            pass
 
         return total
     
     def collect_from_newsapi(self, days_back=7, max_articles=100):
         """Collect anti-India campaign news from NewsAPI and save to DB"""
-        import datetime
-        from database import save_article
-        from config import ANTI_INDIA_KEYWORDS
-        
         if not self.newsapi_key:
             print("❌ No NewsAPI key configured!")
             return 0
         
         base_url = "https://newsapi.org/v2/everything"
+        today = datetime.utcnow()
+        from_date = (today - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        collected_at = today.strftime('%Y-%m-%dT%H:%M:%SZ')
+        params = {
+            'from': from_date,
+            'sortBy': 'publishedAt',
+            'language': 'en',
+            'apiKey': self.newsapi_key,
+            'pageSize': NEWSAPI_PAGE_SIZE
+        }
+        
+        articles = []
+        texts = []
+        # URLs already stored for this window, plus any seen earlier in this run
+        seen = get_article_urls(since=from_date)
+        
+        # Query (keyword, page) pairs NEWSAPI_CONCURRENCY at a time until max_articles are gathered;
+        # a full page queues that keyword's next page behind the remaining work
+        async def _run():
+            pending = deque((keyword, 1) for keyword in NEWSAPI_KEYWORDS)
+            paging = True
+            async with httpx.AsyncClient(headers={'User-Agent': self.session.headers['User-Agent']}, timeout=15) as client:
+                while pending and len(articles) < max_articles:
+                    wave = [pending.popleft() for _ in range(min(NEWSAPI_CONCURRENCY, len(pending)))]
+                    responses = await asyncio.gather(
+                        *[client.get(base_url, params={**params, 'q': keyword, 'page': page}) for keyword, page in wave],
+                        return_exceptions=True
+                    )
+                    for (keyword, page), resp in zip(wave, responses):
+                        if self._newsapi_results_capped(resp):
+                            # The plan's result cap ends pagination for every keyword, not just this one
+                            paging = False
+                            pending = deque(item for item in pending if item[1] == 1)
+                            continue
+                        returned = self._collect_newsapi_response(keyword, resp, articles, texts, seen, max_articles, collected_at)
+                        if paging and returned >= NEWSAPI_PAGE_SIZE:
+                            pending.append((keyword, page + 1))
+        
+        asyncio.run(_run())
+        
+        # Score sentiment in one pass once all network I/O is done
+        for article_data, score in zip(articles, map(self.calculate_sentiment_score, texts)):
+            article_data['sentiment_score'] = score
+        
+        # Save on this thread, NEWSAPI_SAVE_BATCH articles per transaction
         total_saved = 0
-        today = datetime.datetime.utcnow()
-        from_date = (today - datetime.timedelta(days=days_back)).strftime('%Y-%m-%d')
-        
-        for keyword in ANTI_INDIA_KEYWORDS:
-            params = {
-                'q': keyword,
-                'from': from_date,
-                'sortBy': 'publishedAt',
-                'language': 'en',
-                'apiKey': self.newsapi_key,
-                'pageSize': 20
-            }
-            try:
-                resp = self.session.get(base_url, params=params, timeout=15)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    for article in data.get('articles', []):
-                        article_data = {
-                            'title': article.get('title'),
-                            'content': article.get('content') or article.get('description'),
-                            'url': article.get('url'),
-                            'source': article.get('source', {}).get('name'),
-                            'published_at': article.get('publishedAt'),
-                            'collected_at': today.strftime('%Y-%m-%dT%H:%M:%SZ'),
-                            'method': 'NewsAPI',
-                            'keywords_found': keyword,
-                            'sentiment_score': self.calculate_sentiment_score(article.get('content') or "")
-                        }
-                        save_article(article_data)
-                        total_saved += 1
-                        if total_saved >= max_articles:
-                            print(f"✅ Saved {total_saved} news articles from NewsAPI.")
-                            return total_saved
-                else:
-                    print(f"❌ NewsAPI error: {resp.status_code} {resp.text}")
-            except Exception as e:
-                print(f"❌ NewsAPI request failed: {e}")
+        for start in range(0, len(articles), NEWSAPI_SAVE_BATCH):
+            total_saved += save_articles_bulk(articles[start:start + NEWSAPI_SAVE_BATCH])
         print(f"✅ Saved {total_saved} news articles from NewsAPI.")
         return total_saved
+    
+    @staticmethod
+    def _newsapi_results_capped(resp):
+        """True if NewsAPI refused a page past the plan's result limit (the normal end of paging)"""
+        if isinstance(resp, Exception) or resp.status_code not in (400, 426):
+            return False
+        if resp.status_code == 426:
+            return True
+        try:
+            return resp.json().get('code') == 'maximumResultsReached'
+        except ValueError:
+            return False
+
+    def _collect_newsapi_response(self, keyword, resp, articles, texts, seen, max_articles, collected_at):
+        """Append one keyword's unseen NewsAPI articles and their texts, up to max_articles.
+
+        Returns the number of articles on the page, or 0 if the page was not read.
+        """
+        if len(articles) >= max_articles:
+            return 0
+        if isinstance(resp, Exception):
+            print(f"❌ NewsAPI request failed: {resp}")
+            return 0
+        try:
+            if resp.status_code == 200:
+                page = resp.json().get('articles', [])
+                for article in page:
+                    url = article.get('url')
+                    if not url or url in seen:
+                        continue
+                    seen.add(url)
+                    articles.append({
+                        'title': article.get('title'),
+                        'content': article.get('content') or article.get('description'),
+                        'url': url,
+                        'source': article.get('source', {}).get('name'),
+                        'published_at': article.get('publishedAt'),
+                        'collected_at': collected_at,
+                        'method': 'NewsAPI',
+                        'keywords_found': keyword
+                    })
+                    texts.append(article.get('content') or "")
+                    if len(articles) >= max_articles:
+                        break
+                return len(page)
+            print(f"❌ NewsAPI error: {resp.status_code} {resp.text}")
+        except Exception as e:
+            print(f"❌ NewsAPI request failed: {e}")
+        return 0
 
     def ensure_database(self):
         """Ensure the database and articles table exist before saving."""
-        from database import init_database
         try:
             init_database()
             print("✅ Database initialized and ready.")
@@ -5,10 +5,33 @@ Dynamic keyword database with categories, weights, and learning capabilities
 
 import sqlite3
 import json
+import atexit
+import functools
+import threading
+import numpy as np
+from collections import Counter
 from datetime import datetime
 from typing import List, Dict, Set
 import re
 
+# Texts with detections between automatic flush_counters() calls
+COUNTER_FLUSH_INTERVAL = 100
+
+# Columns whose changes invalidate cached detection terms, per table
+KEYWORD_VERSION_COLUMNS = {
+    'keywords': 'keyword, category, weight, is_active',
+    'hashtags': 'hashtag, category, weight, platform',
+    'phrase_patterns': 'pattern, regex_pattern, category, weight',
+}
+
+def _locked(method):
+    """Serialize access to the shared connection"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class KeywordDatabase:
     def __init__(self, db_path=None):
         # Use canonical DATABASE_PATH if not provided to avoid multiple DB files
@@ -20,13 +43,31 @@ class KeywordDatabase:
                 self.db_path = "campaign_data.db"
         else:
             self.db_path = db_path
+        
+        # One connection for the lifetime of the instance, shared across threads under a lock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        atexit.register(self.close)
+        
+        # Detection counts accumulated in memory until flush_counters()
+        self._pending_kw_counts = Counter()
+        self._pending_ht_counts = Counter()
+        self._pending_pat_counts = Counter()
+        self._pending_last = {}  # (kind, term) -> (detected entry, last detection time)
+        self._pending_detections = 0
+        
         self.init_keyword_tables()
         self.load_default_keywords()
+        self._invalidate_cache()
+        self._build_phrase_matcher()
+        self._terms_version = self._keyword_version()
     
+    @_locked
     def init_keyword_tables(self):
         """Initialize keyword database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         # Keywords table with categories and weights
         cursor.execute('''
@@ -85,17 +126,44 @@ class KeywordDatabase:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Match the filters and ORDER BY of get_active_keywords/get_active_hashtags
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_kw_active_weight
+            ON keywords (is_active, weight DESC, detection_count DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_ht_platform_weight
+            ON hashtags (platform, weight DESC, usage_count DESC)
+        ''')
+        
+        # Version bumped by triggers whenever detection terms change, from any connection;
+        # count-only updates are excluded so flush_counters() does not invalidate caches
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO keyword_version (id, version) VALUES (1, 0)")
+        for table, columns in KEYWORD_VERSION_COLUMNS.items():
+            for event in ('INSERT', 'DELETE', f"UPDATE OF {columns}"):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.split()[0].lower()}_version
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE keyword_version SET version = version + 1 WHERE id = 1;
+                    END
+                ''')
+        
+        self._conn.commit()
     
+    @_locked
     def load_default_keywords(self):
         """Load default keyword sets if database is empty"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         cursor.execute("SELECT COUNT(*) FROM keywords")
         if cursor.fetchone()[0] > 0:
-            conn.close()
             return
         
         # Core anti-India keywords with categories and weights
@@ -141,11 +209,10 @@ class KeywordDatabase:
             ("Indian lies", "disinformation", 1.0),
         ]
         
-        for keyword, category, weight in default_keywords:
-            cursor.execute('''
-                INSERT OR IGNORE INTO keywords (keyword, category, weight)
-                VALUES (?, ?, ?)
-            ''', (keyword, category, weight))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO keywords (keyword, category, weight)
+            VALUES (?, ?, ?)
+        ''', default_keywords)
         
         # Default hashtags
         default_hashtags = [
@@ -159,11 +226,10 @@ class KeywordDatabase:
             ("#HatePropaganda", "general_hate", 1.5, "general"),
         ]
         
-        for hashtag, category, weight, platform in default_hashtags:
-            cursor.execute('''
-                INSERT OR IGNORE INTO hashtags (hashtag, category, weight, platform)
-                VALUES (?, ?, ?, ?)
-            ''', (hashtag, category, weight, platform))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO hashtags (hashtag, category, weight, platform)
+            VALUES (?, ?, ?, ?)
+        ''', default_hashtags)
         
         # Phrase patterns for complex detection
         phrase_patterns = [
@@ -174,36 +240,35 @@ class KeywordDatabase:
             ("India behind terrorism", r"india\s+(behind|funding|supporting)\s+terrorism", "conspiracy", 2.1),
         ]
         
-        for pattern, regex, category, weight in phrase_patterns:
-            cursor.execute('''
-                INSERT OR IGNORE INTO phrase_patterns (pattern, regex_pattern, category, weight)
-                VALUES (?, ?, ?, ?)
-            ''', (pattern, regex, category, weight))
+        cursor.executemany('''
+            INSERT OR IGNORE INTO phrase_patterns (pattern, regex_pattern, category, weight)
+            VALUES (?, ?, ?, ?)
+        ''', phrase_patterns)
         
-        conn.commit()
-        conn.close()
+        # Refresh planner statistics now the tables are populated, then commit all three loads at once
+        cursor.execute("ANALYZE")
+        self._conn.commit()
     
+    @_locked
     def add_keyword(self, keyword: str, category: str, weight: float = 1.0, language: str = 'en'):
         """Add new keyword to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         try:
             cursor.execute('''
                 INSERT INTO keywords (keyword, category, weight, language)
                 VALUES (?, ?, ?, ?)
             ''', (keyword.lower(), category, weight, language))
-            conn.commit()
+            self._conn.commit()
+            self._invalidate_cache()
             return True
         except sqlite3.IntegrityError:
             return False
-        finally:
-            conn.close()
     
+    @_locked
     def add_hashtag(self, hashtag: str, category: str, weight: float = 1.0, platform: str = 'general'):
         """Add new hashtag to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         hashtag = hashtag if hashtag.startswith('#') else f"#{hashtag}"
         
@@ -212,17 +277,34 @@ class KeywordDatabase:
                 INSERT INTO hashtags (hashtag, category, weight, platform)
                 VALUES (?, ?, ?, ?)
             ''', (hashtag.lower(), category, weight, platform))
-            conn.commit()
+            self._conn.commit()
+            self._invalidate_cache()
             return True
         except sqlite3.IntegrityError:
             return False
-        finally:
-            conn.close()
     
+    @_locked
+    def add_phrase_pattern(self, pattern: str, regex_pattern: str, category: str, weight: float = 1.0, description: str = None):
+        """Add new phrase pattern to database"""
+        # Reject the pattern before it is stored, compiled exactly as _build_phrase_matcher will
+        try:
+            re.compile(regex_pattern, re.IGNORECASE)
+        except re.error:
+            return False
+        
+        cursor = self._conn.cursor()
+        cursor.execute('''
+            INSERT INTO phrase_patterns (pattern, regex_pattern, category, weight, description)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (pattern, regex_pattern, category, weight, description))
+        self._conn.commit()
+        self._build_phrase_matcher()
+        return True
+    
+    @_locked
     def get_active_keywords(self, category: str = None, min_weight: float = 0.0) -> List[Dict]:
         """Get active keywords with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         query = '''
             SELECT keyword, category, weight, detection_count
@@ -239,7 +321,6 @@ class KeywordDatabase:
         
         cursor.execute(query, params)
         results = cursor.fetchall()
-        conn.close()
         
         return [
             {
@@ -251,23 +332,22 @@ class KeywordDatabase:
             for row in results
         ]
     
+    @_locked
     def get_active_hashtags(self, platform: str = None) -> List[Dict]:
         """Get active hashtags for monitoring"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         query = "SELECT hashtag, category, weight, platform, usage_count FROM hashtags"
         params = []
         
         if platform:
-            query += " WHERE platform = ? OR platform = 'general'"
-            params.append(platform)
+            query += " WHERE platform IN (?, ?)"
+            params.extend([platform, 'general'])
         
         query += " ORDER BY weight DESC, usage_count DESC"
         
         cursor.execute(query, params)
         results = cursor.fetchall()
-        conn.close()
         
         return [
             {
@@ -280,66 +360,122 @@ class KeywordDatabase:
             for row in results
         ]
     
-    def detect_keywords_in_text(self, text: str) -> Dict:
-        """Detect keywords and calculate threat score"""
-        text_lower = text.lower()
-        detected_keywords = []
-        detected_hashtags = []
-        detected_patterns = []
-        total_score = 0.0
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check keywords
-        keywords = self.get_active_keywords()
-        for kw in keywords:
-            if kw['keyword'] in text_lower:
-                detected_keywords.append(kw)
-                total_score += kw['weight']
-                
-                # Update detection count
-                cursor.execute('''
-                    UPDATE keywords 
-                    SET detection_count = detection_count + 1, last_detected = CURRENT_TIMESTAMP
-                    WHERE keyword = ?
-                ''', (kw['keyword'],))
-        
-        # Check hashtags
-        hashtags = self.get_active_hashtags()
-        for ht in hashtags:
-            if ht['hashtag'] in text_lower:
-                detected_hashtags.append(ht)
-                total_score += ht['weight']
-                
-                # Update usage count
-                cursor.execute('''
-                    UPDATE hashtags 
-                    SET usage_count = usage_count + 1, last_used = CURRENT_TIMESTAMP
-                    WHERE hashtag = ?
-                ''', (ht['hashtag'],))
-        
-        # Check phrase patterns
+    def close(self):
+        """Write pending counts and close the shared connection"""
+        with self._lock:
+            if self._conn is not None:
+                self.flush_counters()
+                self._conn.close()
+                self._conn = None
+    
+    def _invalidate_cache(self):
+        """Drop the cached lists; they and the scanner are rebuilt on next use"""
+        self._kw_cache = None
+        self._ht_cache = None
+        self._scanner_ready = False
+    
+    def _keyword_version(self):
+        return self._conn.execute("SELECT version FROM keyword_version WHERE id = 1").fetchone()[0]
+    
+    def _refresh_if_changed(self):
+        """Reload cached keywords, hashtags and patterns if any connection changed them"""
+        version = self._keyword_version()
+        if version != self._terms_version:
+            self._terms_version = version
+            self._invalidate_cache()
+            self._build_phrase_matcher()
+    
+    def _keywords(self) -> List[Dict]:
+        if self._kw_cache is None:
+            self._kw_cache = self.get_active_keywords()
+        return self._kw_cache
+    
+    def _hashtags(self) -> List[Dict]:
+        if self._ht_cache is None:
+            self._ht_cache = self.get_active_hashtags()
+        return self._ht_cache
+    
+    @_locked
+    def _build_phrase_matcher(self):
+        """Compile each phrase pattern once, kept until patterns change"""
+        cursor = self._conn.cursor()
         cursor.execute("SELECT pattern, regex_pattern, category, weight FROM phrase_patterns")
-        patterns = cursor.fetchall()
-        
-        for pattern, regex_pattern, category, weight in patterns:
-            if re.search(regex_pattern, text_lower, re.IGNORECASE):
-                detected_patterns.append({
-                    'pattern': pattern,
-                    'category': category,
-                    'weight': weight
-                })
-                total_score += weight
-                
-                cursor.execute('''
-                    UPDATE phrase_patterns 
-                    SET detection_count = detection_count + 1
-                    WHERE pattern = ?
-                ''', (pattern,))
-        
-        conn.commit()
-        conn.close()
+        
+        # Searched one by one, so overlapping patterns, backreferences and inline flags behave as written
+        self._phrases = []
+        for pattern, regex_pattern, category, weight in cursor.fetchall():
+            try:
+                regex = re.compile(regex_pattern, re.IGNORECASE)
+            except re.error as e:
+                # A bad row written outside add_phrase_pattern is skipped rather than breaking detection
+                print(f"Skipping phrase pattern {pattern!r}: {e}")
+                continue
+            self._phrases.append((regex, {
+                'pattern': pattern,
+                'category': category,
+                'weight': weight
+            }))
+    
+    def _build_scanner(self):
+        """Build the keyword and hashtag scanner used by detect_keywords_in_text"""
+        self._scan_keywords = [(kw['keyword'].lower(), kw) for kw in self._keywords()]
+        self._scan_hashtags = [(ht['hashtag'].lower(), ht) for ht in self._hashtags()]
+        self._scan_terms = tuple({term for term, _ in self._scan_keywords + self._scan_hashtags})
+        self._scanner_ready = True
+    
+    def _match(self, text_lower):
+        """Return the keywords, hashtags and phrase patterns found in lowered text"""
+        if not self._scanner_ready:
+            self._build_scanner()
+        
+        # Keywords and hashtags: substring checks on the lowered str beat
+        # both a combined alternation regex and a bytes buffer here
+        found = {term for term in self._scan_terms if term in text_lower}
+        detected_keywords = [kw for term, kw in self._scan_keywords if term in found]
+        detected_hashtags = [ht for term, ht in self._scan_hashtags if term in found]
+        
+        detected_patterns = [pt for regex, pt in self._phrases if regex.search(text_lower)]
+        return detected_keywords, detected_hashtags, detected_patterns
+    
+    @_locked
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """Threat scores for many texts without updating detection counters"""
+        self._refresh_if_changed()
+        scores = np.zeros(len(texts))
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            detected_keywords, detected_hashtags, detected_patterns = self._match(text.lower())
+            scores[i] = (sum(kw['weight'] for kw in detected_keywords)
+                         + sum(ht['weight'] for ht in detected_hashtags)
+                         + sum(pt['weight'] for pt in detected_patterns))
+        return scores
+    
+    @_locked
+    def detect_keywords_in_text(self, text: str, record_stats: bool = True) -> Dict:
+        """Detect keywords and calculate threat score; record_stats=False leaves detection counts untouched"""
+        total_score = 0.0
+        self._refresh_if_changed()
+        detected_keywords, detected_hashtags, detected_patterns = self._match(text.lower())
+        
+        total_score += sum(kw['weight'] for kw in detected_keywords)
+        total_score += sum(ht['weight'] for ht in detected_hashtags)
+        total_score += sum(pt['weight'] for pt in detected_patterns)
+        
+        # Count detections in memory; flush_counters() writes them in bulk
+        if record_stats and (detected_keywords or detected_hashtags or detected_patterns):
+            now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+            for kw in detected_keywords:
+                self._pending_kw_counts[kw['keyword']] += 1
+                self._pending_last[('kw', kw['keyword'])] = (kw, now)
+            for ht in detected_hashtags:
+                self._pending_ht_counts[ht['hashtag']] += 1
+                self._pending_last[('ht', ht['hashtag'])] = (ht, now)
+            for pt in detected_patterns:
+                self._pending_pat_counts[pt['pattern']] += 1
+            self._pending_detections += 1
+            if self._pending_detections >= COUNTER_FLUSH_INTERVAL:
+                self.flush_counters()
         
         # Calculate threat level
         threat_level = "NONE"
@@ -361,16 +497,58 @@ class KeywordDatabase:
                                  [pt['category'] for pt in detected_patterns]))
         }
     
+    @_locked
+    def flush_counters(self):
+        """Write pending detection counts in one transaction"""
+        if not (self._pending_kw_counts or self._pending_ht_counts or self._pending_pat_counts):
+            return
+        cursor = self._conn.cursor()
+        # Upserts, so a term removed since it was cached is recreated with its counts
+        kw_rows = []
+        for kw, n in self._pending_kw_counts.items():
+            meta, last = self._pending_last[('kw', kw)]
+            kw_rows.append((kw, meta['category'], meta['weight'], n, last))
+        cursor.executemany('''
+            INSERT INTO keywords (keyword, category, weight, detection_count, last_detected)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(keyword) DO UPDATE SET
+                detection_count = detection_count + excluded.detection_count,
+                last_detected = excluded.last_detected
+        ''', kw_rows)
+        ht_rows = []
+        for ht, n in self._pending_ht_counts.items():
+            meta, last = self._pending_last[('ht', ht)]
+            ht_rows.append((ht, meta['category'], meta['weight'], meta['platform'], n, last))
+        cursor.executemany('''
+            INSERT INTO hashtags (hashtag, category, weight, platform, usage_count, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(hashtag) DO UPDATE SET
+                usage_count = usage_count + excluded.usage_count,
+                last_used = excluded.last_used
+        ''', ht_rows)
+        # phrase_patterns.pattern has no UNIQUE constraint to upsert against
+        cursor.executemany('''
+            UPDATE phrase_patterns 
+            SET detection_count = detection_count + ?
+            WHERE pattern = ?
+        ''', [(n, pattern) for pattern, n in self._pending_pat_counts.items()])
+        self._conn.commit()
+        
+        self._pending_kw_counts.clear()
+        self._pending_ht_counts.clear()
+        self._pending_pat_counts.clear()
+        self._pending_last.clear()
+        self._pending_detections = 0
+    
+    @_locked
     def update_keyword_effectiveness(self, keyword: str, is_true_positive: bool):
         """Update keyword effectiveness based on manual review"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
         
         # Get keyword ID
         cursor.execute("SELECT id FROM keywords WHERE keyword = ?", (keyword,))
         result = cursor.fetchone()
         if not result:
-            conn.close()
             return
         
         keyword_id = result[0]
@@ -404,13 +582,13 @@ class KeywordDatabase:
             WHERE keyword_id = ?
         ''', (keyword_id,))
         
-        conn.commit()
-        conn.close()
+        self._conn.commit()
     
+    @_locked
     def get_keyword_analytics(self) -> Dict:
         """Get keyword performance analytics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.flush_counters()
+        cursor = self._conn.cursor()
         
         # Top performing keywords
         cursor.execute('''
@@ -444,7 +622,6 @@ class KeywordDatabase:
         ''')
         recent_detections = cursor.fetchall()
         
-        conn.close()
         
         return {
             'top_keywords': [